@@ -36,12 +36,22 @@ class Env:
         self._app__name = os.getenv("APP__NAME", "STAC_DC")
         self._app__log_level = os.getenv("APP__LOG_LEVEL", "INFO").upper()
 
+        # Multipart transfers of large files to/from S3
+        self._app__s3_multipart_chunksize = int(os.getenv("APP__S3_MULTIPART_CHUNKSIZE", str(64 * 1024 * 1024)))  # B
+        self._app__s3_max_concurrency = int(os.getenv("APP__S3_MAX_CONCURRENCY", "16"))
+
     def get_app__name(self) -> str:
         return self._app__name
 
     def get_app__log_level(self) -> str:
         return self._app__log_level
 
+    def get_app__s3_multipart_chunksize(self) -> int:
+        return self._app__s3_multipart_chunksize
+
+    def get_app__s3_max_concurrency(self) -> int:
+        return self._app__s3_max_concurrency
+
     def get_app__project_root(self) -> Path:
         if self._app__project_root is None:
             raise ProjectRootNotSet()
@@ -113,6 +123,14 @@ class Env:
         self._landsat['m2m_token'] = os.getenv("LANDSAT__M2M_TOKEN", default=None)
         self._landsat['m2m_scene_label'] = os.getenv("LANDSAT__M2M_SCENE_LABEL", default=None)
 
+        # Backoff of polling for downloads being prepared by USGS
+        self._landsat['m2m_poll_backoff_min'] = float(os.getenv("LANDSAT__M2M_POLL_BACKOFF_MIN", "0.5"))  # seconds
+        self._landsat['m2m_poll_backoff_max'] = float(os.getenv("LANDSAT__M2M_POLL_BACKOFF_MAX", "60"))  # seconds
+        self._landsat['m2m_poll_backoff_base'] = float(os.getenv("LANDSAT__M2M_POLL_BACKOFF_BASE", "1.3"))
+
+        # Number of items downloaded at once, keep within USGS per-user limits
+        self._landsat['download_concurrency'] = int(os.getenv("LANDSAT__DOWNLOAD_CONCURRENCY", "4"))
+
         self._landsat['redownload_threshold'] = int(os.getenv("LANDSAT__REDOWNLOAD_THRESHOLD", "28")) # days
         self._landsat['recatalogize_only'] = (
                 os.getenv("LANDSAT__RECATALOGIZE_ONLY", default="False").lower() in self._true_statements
@@ -70,10 +70,8 @@ class ERA5Worker(CDSWorker):
         today = datetime.now(timezone.utc).date()
         last_downloaded = self._get_last_downloaded_day() or today
 
-        def daterange(start: date, end: date):
-            while start <= end:
-                yield start
-                start += timedelta(days=1)
+        def daterange(start: date, end: date) -> List[date]:
+            return [start + timedelta(days=i) for i in range((end - start).days + 1)]
 
         # intervals
         gap_days = max(0, (today - last_downloaded).days)
@@ -9,9 +9,10 @@ if TYPE_CHECKING:
 
 from typing import Any, List, Tuple
 
-import json
 import logging
 
+import orjson
+
 from abc import ABC, abstractmethod
 from datetime import date, datetime
 from tempfile import NamedTemporaryFile
@@ -99,8 +100,7 @@ class DatasetWorker(ABC):
             try:
                 with NamedTemporaryFile(mode='w+b', suffix='.json', delete=False) as tmp_file:
                     self._storage.download(remote_file_path=remote_file_path, local_file_path=tmp_file.name)
-                    tmp_file.seek(0)
-                    data = json.load(tmp_file)
+                    data = orjson.loads(Path(tmp_file.name).read_bytes())
 
             finally:
                 tmp_file.close()
@@ -127,15 +127,13 @@ class DatasetWorker(ABC):
 
                 try:
                     self._storage.download(remote_file_path=remote_file_path, local_file_path=tmp_file.name)
-                    with open(tmp_file.name, "r", encoding="utf-8") as f:
-                        contents = json.load(f)
+                    contents = orjson.loads(Path(tmp_file.name).read_bytes())
                 except Exception:
                     contents = {}
 
                 contents[self._aoi.get_name()] = last_downloaded_day.strftime("%Y-%m-%d")
 
-                with open(tmp_file.name, "w", encoding="utf-8") as f:
-                    json.dump(contents, f, indent=2)
+                Path(tmp_file.name).write_bytes(orjson.dumps(contents, option=orjson.OPT_INDENT_2))
 
                 self._storage.upload(local_file_path=tmp_file.name, remote_file_path=remote_file_path)
 
@@ -1,13 +1,15 @@
-import json
 import logging
 import mimetypes
 import os
+import shutil
 import tarfile
 
+import orjson
 import requests
 import re
 
-from urllib.parse import urlparse, urlunsplit
+from concurrent.futures import ThreadPoolExecutor, wait
+from urllib.parse import urlparse
 from pathlib import Path
 from tempfile import TemporaryDirectory
 
@@ -35,6 +37,14 @@ class DownloadedFile:
         "landsat_mss_c2_l1": "Landsat 1-5 MSS C2 L1"
     }
 
+    # MIME types of assets appended to the feature, resolved by file suffix
+    _EXT_TYPES = {
+        ".xml": "application/xml",
+        ".tar": "application/x-tar",
+        ".jpg": "image/jpeg",
+        ".png": "image/png",
+    }
+
     _stac_connector: STAC
     _s3_connector: S3
 
@@ -46,6 +56,7 @@ class DownloadedFile:
     _metadata_xml_file_path = None
     _angle_coefficient_file_path = None
     _pregenerated_stac_item_file_path = None
+    _thumbnail_file_path = None
     _feature_json_file_path = None
 
     _feature_dict = None
@@ -57,6 +68,9 @@ class DownloadedFile:
     # True if we want to redownload file eventhough it is already downloaded
     _force_redownload_file = False
 
+    # Second attempt of process() is run with _force_redownload_file set to True
+    _max_process_attempts = 2
+
     def __init__(
             self,
             attributes=None,
@@ -106,10 +120,16 @@ class DownloadedFile:
         self._stac_connector = stac_connector
 
         self._download_host = urlparse(stac_asset_download_root)
+        self._asset_url_prefix = (
+            f"{self._download_host.scheme}://{self._download_host.netloc}{self._download_host.path}"
+        )
 
         self._workdir_temp = TemporaryDirectory()
         self._workdir = Path(self._workdir_temp.name)
 
+        # Executor used for uploading the data tarball while metadata and STAC item are being prepared
+        self._upload_executor = ThreadPoolExecutor(max_workers=1)
+
         self.exception_occurred = None
 
     def __del__(self):
@@ -117,6 +137,9 @@ class DownloadedFile:
         Destructor, removes the temporary workdir
         :return:
         """
+        if getattr(self, "_upload_executor", None):
+            self._upload_executor.shutdown(wait=True)
+
         if self._workdir_temp:
             self._workdir_temp.cleanup()
 
@@ -144,9 +167,59 @@ class DownloadedFile:
         Basically main method of DownloadedFile class
         This method downloads the file using self._download_self(), uploads it to S3 storage, creates STAC item and
         registers it to STAC
+
+        If the file is marked as downloaded but is missing on S3, the whole pipeline is run once again with
+        self._force_redownload_file set to True
         :return:
         """
 
+        for attempt in range(1, self._max_process_attempts + 1):
+            self._reset_state()
+
+            try:
+                self._process_once()
+                return
+
+            except DownloadedFileRedownloadNeeded as e:
+                self._logger.error(e)
+                self._logger.error(f"We need to re-download file again from USGS (attempt {attempt})")
+
+                self._force_redownload_file = True  # Setting the _force_redownload_file flag to True
+                self.exception_occurred = e
+
+            except Exception as exception:
+                self.exception_occurred = exception
+                return
+
+    def _reset_state(self):
+        """
+        Method resets everything a previous attempt of self._process_once() may have left behind
+        :return: None
+        """
+
+        self._data_file_downloaded = False
+        self._data_file_path = None
+        self._metadata_xml_file_path = None
+        self._angle_coefficient_file_path = None
+        self._pregenerated_stac_item_file_path = None
+        self._thumbnail_file_path = None
+        self._feature_json_file_path = None
+
+        self._feature_dict = None
+        self._feature_id = None
+
+        self.exception_occurred = None
+
+    def _process_once(self):
+        """
+        Single attempt of downloading, uploading and registering the file, see self.process()
+
+        :raises DownloadedFileRedownloadNeeded: If the file has to be downloaded from USGS again
+        :return: None
+        """
+
+        upload_future = None
+
         try:
             # ============================================ DOWNLOADING FILE ============================================
             while True:
@@ -161,8 +234,8 @@ class DownloadedFile:
             # ==========================================================================================================
 
             if self._data_file_downloaded:
-                # Uploading data file to S3
-                self._upload_to_s3(local_file=self._data_file_path)
+                # Uploading data file to S3 in background, metadata and STAC item only need the local tarball
+                upload_future = self._upload_executor.submit(self._upload_to_s3, local_file=self._data_file_path)
 
             else:
                 # File should already be downloaded in S3, just regenerate feature JSON and re-register it
@@ -171,12 +244,7 @@ class DownloadedFile:
 
                 except botocore.exceptions.ClientError as e:
                     if e.response['Error']['Code'] == '404':
-                        self._logger.error(e)
-                        self._logger.error("We need to re-download file again from USGS")
-
-                        self._force_redownload_file = True  # Setting the _force_redownload_file flag to True
-                        self.process()  # Running again self.process method to process the file again
-                        return  # After processing the file again return from this method to prevent never-ending loop
+                        raise DownloadedFileRedownloadNeeded(display_id=self._display_id) from e
                     else:
                         raise e
 
@@ -195,6 +263,10 @@ class DownloadedFile:
             # Adding assests (data, metadata, thumbnail...) to feature
             self._append_assets_to_feature()
 
+            # Data file must be uploaded before the feature pointing to it is registered
+            if upload_future is not None:
+                upload_future.result()
+
             # Registering feature to STAC
             self._feature_id = self._stac_connector.register_stac_item(
                 json_dict=self._feature_dict, collection=self._dataset
@@ -208,8 +280,10 @@ class DownloadedFile:
 
             self._upload_to_s3(local_file=self._prepare_feature_id_file())
 
-        except Exception as exception:
-            self.exception_occurred = exception
+        finally:
+            # Never leave the upload running on a tarball which is about to be cleaned up
+            if upload_future is not None:
+                wait([upload_future])
 
     def _check_if_already_downloaded(self, expected_length=None):
         """
@@ -269,10 +343,10 @@ class DownloadedFile:
 
         self._logger.info(f"Downloading {self._url} into {str(self._data_file_path)}.")
 
-        # Iterating through the content of downloaded file and writing it into self._data_file
+        # Copying the raw content of downloaded file into self._data_file in 4 MiB blocks
+        response.raw.decode_content = True
         with open(self._data_file_path, mode='wb') as result_file:
-            for chunk in response.iter_content(chunk_size=(1024 * 1024)):
-                result_file.write(chunk)
+            shutil.copyfileobj(response.raw, result_file, length=(4 * 1024 * 1024))
 
         # Checking whether the downloaded size is the same as expected size (Content-Length returned by download server)
         expected_size = int(response.headers['Content-Length'])
@@ -356,8 +430,8 @@ class DownloadedFile:
         """
         self._feature_json_file_path = self._workdir.joinpath(self._display_id + "_feature.json")
 
-        with open(self._feature_json_file_path, "w") as feature_json_file:
-            feature_json_file.write(json.dumps(self._feature_dict))
+        with open(self._feature_json_file_path, "wb") as feature_json_file:
+            feature_json_file.write(orjson.dumps(self._feature_dict))
 
     def _stac_item_clear(self, stac_item_dict):
         """
@@ -388,8 +462,7 @@ class DownloadedFile:
         except Exception as stactools_exception:
             self._logger.warning("stactools were unable to create STAC item, using pre-generated STAC item.")
             if self._pregenerated_stac_item_file_path is not None:
-                with open(self._pregenerated_stac_item_file_path, 'r') as pregenerated_stac_item_file:
-                    stac_item_dict = json.loads(pregenerated_stac_item_file.read())
+                stac_item_dict = orjson.loads(Path(self._pregenerated_stac_item_file_path).read_bytes())
             else:
                 raise DownloadedFileCannotCreateStacItem(
                     f"Unable to create STAC item. stactools.landsat exception: {str(stactools_exception)}, " +
@@ -402,47 +475,41 @@ class DownloadedFile:
 
         self._feature_dict = stac_item_dict
 
+    def _get_mime_type(self, file_path):
+        """
+        Method returns MIME type of given file, falling back to mimetypes for unknown suffixes
+
+        :param file_path: Path to the file
+        :return: MIME type string or None
+        """
+        suffix = Path(file_path).suffix.lower()
+        if suffix in self._EXT_TYPES:
+            return self._EXT_TYPES[suffix]
+
+        return mimetypes.guess_type(str(file_path))[0]
+
     def _append_assets_to_feature(self):
+        dataset_fullname = self._dataset_fullname[self._dataset]
+
         self._feature_dict['assets'].update(
             {
                 'mtl.xml': {
-                    'href': urlunsplit(
-                        (
-                            self._download_host.scheme,
-                            self._download_host.netloc,
-                            f"{self._download_host.path}{self._get_s3_bucket_key_of_file(self._metadata_xml_file_path)}",
-                            "", ""
-                        )
-                    ),
-                    'type': mimetypes.guess_type(str(self._metadata_xml_file_path))[0],
+                    'href': f"{self._asset_url_prefix}{self._get_s3_bucket_key_of_file(self._metadata_xml_file_path)}",
+                    'type': self._get_mime_type(self._metadata_xml_file_path),
                     'title': f"Metadata",
-                    'description': f"Metadata for {self._dataset_fullname[self._dataset]} item {self._display_id}."
+                    'description': f"Metadata for {dataset_fullname} item {self._display_id}."
                 },
                 'data': {
-                    'href': urlunsplit(
-                        (
-                            self._download_host.scheme,
-                            self._download_host.netloc,
-                            f"{self._download_host.path}{self._get_s3_bucket_key_of_file(self._data_file_path)}",
-                            "", ""
-                        )
-                    ),
-                    'type': mimetypes.guess_type(str(self._data_file_path))[0],
+                    'href': f"{self._asset_url_prefix}{self._get_s3_bucket_key_of_file(self._data_file_path)}",
+                    'type': self._get_mime_type(self._data_file_path),
                     'title': f"Data",
-                    'description': f"{self._dataset_fullname[self._dataset]} full data tarball for item {self._display_id}."
+                    'description': f"{dataset_fullname} full data tarball for item {self._display_id}."
                 },
                 'thumbnail': {
-                    'href': urlunsplit(
-                        (
-                            self._download_host.scheme,
-                            self._download_host.netloc,
-                            f"{self._download_host.path}{self._get_s3_bucket_key_of_file(self._thumbnail_file_path)}",
-                            "", ""
-                        )
-                    ),
-                    'type': mimetypes.guess_type(str(self._thumbnail_file_path))[0],
+                    'href': f"{self._asset_url_prefix}{self._get_s3_bucket_key_of_file(self._thumbnail_file_path)}",
+                    'type': self._get_mime_type(self._thumbnail_file_path),
                     'title': f"Thumbnail",
-                    'description': f"Thumbnail for {self._dataset_fullname[self._dataset]} item {self._display_id}."
+                    'description': f"Thumbnail for {dataset_fullname} item {self._display_id}."
                 }
             }
         )
@@ -467,7 +534,7 @@ class DownloadedFile:
 
         feature_id_json_file_path = self._workdir.joinpath(self._display_id + "_featureId.json")
 
-        with open(feature_id_json_file_path, "w") as feature_id_json_file:
-            feature_id_json_file.write(json.dumps(feature_id_json_dict))
+        with open(feature_id_json_file_path, "wb") as feature_id_json_file:
+            feature_id_json_file.write(orjson.dumps(feature_id_json_dict))
 
         return feature_id_json_file_path
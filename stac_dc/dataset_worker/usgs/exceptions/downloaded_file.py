@@ -72,3 +72,8 @@ class DownloadedFileCannotCreateStacItem(DownloadedFileError):
 class DownloadedFileFilenameToUntarNotSpecified(DownloadedFileError):
     def __init__(self, message="Filename to be extracted from tar archive not specified!", display_id=None):
         super().__init__(message=message, display_id=display_id)
+
+
+class DownloadedFileRedownloadNeeded(DownloadedFileError):
+    def __init__(self, message="File not found on S3, it needs to be downloaded again!", display_id=None):
+        super().__init__(message=message, display_id=display_id)
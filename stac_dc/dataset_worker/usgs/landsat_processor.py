@@ -1,6 +1,7 @@
-import json
 import logging
+import math
 
+import orjson
 import xmltodict
 
 from enum import Enum
@@ -12,6 +13,14 @@ from .exceptions.landsat_processor import *
 
 from env import env
 
+_STAC_ASSET_DOWNLOAD_ROOT: str = env.get_landsat()["stac_asset_download_root"]
+_STAC_JSON_SUFFIXES: tuple[str, ...] = ("_stac.json", "_STAC.json")
+
+# Raw template is read once, every item gets a fresh dict from orjson.loads
+_STAC_TEMPLATE_BYTES: bytes = (
+        Path(__file__).resolve().parent / "stac_templates" / "[feature]landsat.json"
+).read_bytes()
+
 
 class MTL_TYPE(Enum):
     JSON = "_MTL.json"
@@ -19,12 +28,17 @@ class MTL_TYPE(Enum):
     XML = "_MTL.xml"
 
 
+# Tar members read into memory during the single scan of the archive
+_METADATA_SUFFIXES: tuple[str, ...] = _STAC_JSON_SUFFIXES + tuple(mtl_type.value for mtl_type in MTL_TYPE)
+
+
 class LandsatProcessor:
     _landsat_tar_utils: LandsatTarUtils = None
 
     _tar_path: Path = None
     _dataset: str = None
     _tar_indexes: dict = None
+    _tar_metadata_files: dict[str, bytes] = None
     _stac_json_dict: dict = None
 
     def __init__(
@@ -36,36 +50,37 @@ class LandsatProcessor:
 
         if landsat_tar_path is None:
             raise LandsatTarFileNotSpecifiedException()
-        self._tar_path = landsat_tar_path
+        self._tar_path = Path(landsat_tar_path)
 
         if dataset is None:
             raise LandsatDatasetNotSpecified()
         self._dataset = dataset
 
-        self._logger = logger
+        # Download URL of the whole tar, asset hrefs only append tar member query to it
+        self._asset_href_prefix: str = f"{_STAC_ASSET_DOWNLOAD_ROOT}{self._dataset}/{self._tar_path.name}"
+        self._asset_href_template: str = f"{self._asset_href_prefix}?tarMemberFile=%s&offset=%d&size=%d"
 
-    def _load_stac_from_tar(self):
-        stac_json_tar_members = [
-            member for member in self._landsat_tar_utils.get_members()
-            if "_stac.json".lower() in member.name.lower()
-        ]
-
-        if len(stac_json_tar_members) == 0:
-            raise LandsatTarDoesNotContainStacFile(self._tar_path)
+        self._logger = logger
 
-        stac_json_paths = []
-        for stac_json_tar_member in stac_json_tar_members:
-            stac_json_paths.append(self._landsat_tar_utils.untar_member(stac_json_tar_member))
+    def _scan_tar(self):
+        self._tar_indexes, self._tar_metadata_files = self._landsat_tar_utils.scan(
+            extract_predicate=lambda member: member.name.endswith(_METADATA_SUFFIXES)
+        )
 
-        stac_json_dict_tmp = {}
+    def _load_stac_from_tar(self):
+        if self._tar_metadata_files is None:
+            self._scan_tar()
 
-        for stac_json_path in stac_json_paths:
-            with open(stac_json_path, "r") as f:
-                stac_json_dict_tmp.update({stac_json_path.name: json.load(f)})
+        stac_json_dict_tmp = {
+            name: orjson.loads(contents)
+            for name, contents in self._tar_metadata_files.items()
+            if name.endswith(_STAC_JSON_SUFFIXES)
+        }
 
-            stac_json_path.unlink()
+        if len(stac_json_dict_tmp) == 0:
+            raise LandsatTarDoesNotContainStacFile(self._tar_path)
 
-        final_stac_dict = stac_json_dict_tmp[list(stac_json_dict_tmp.keys())[0]]
+        final_stac_dict = next(iter(stac_json_dict_tmp.values()))
         final_assets = {}
         final_description = ""
 
@@ -75,20 +90,13 @@ class LandsatProcessor:
             else:
                 final_description += " & " + stac_json_dict["description"]
 
-            final_assets = {**final_assets, **stac_json_dict["assets"]}
+            final_assets.update(stac_json_dict["assets"])
 
         final_stac_dict["description"] = final_description
         final_stac_dict["assets"] = final_assets
 
-        try:
-            final_stac_dict["properties"].pop("card4l:specification")
-        except KeyError:
-            pass
-
-        try:
-            final_stac_dict["properties"].pop("card4l:specification_version")
-        except KeyError:
-            pass
+        final_stac_dict["properties"].pop("card4l:specification", None)
+        final_stac_dict["properties"].pop("card4l:specification_version", None)
 
         self._stac_json_dict = final_stac_dict
 
@@ -97,7 +105,7 @@ class LandsatProcessor:
             self._load_stac_from_tar()
 
         if self._tar_indexes is None:
-            self._tar_indexes = self._landsat_tar_utils.build_index()
+            self._scan_tar()
 
         self._stac_json_dict["id"] = self._tar_path.stem
 
@@ -106,33 +114,33 @@ class LandsatProcessor:
 
         self._stac_json_dict["collection"] = self._dataset
 
-        for asset_key in self._stac_json_dict["assets"].keys():
-            asset = self._stac_json_dict["assets"][asset_key]
-
-            try:
-                asset.pop("alternate")
-            except Exception as e:
-                raise e
-
-            try:
-                asset.pop("file:checksum")
-            except Exception as e:
-                raise e
-
-            for tar_member_file in self._tar_indexes.keys():
-                if tar_member_file in asset["href"]:
-                    asset["href"] = (
-                        f"{env.get_landsat()["stac_asset_download_root"]}{self._dataset}/{self._tar_path.name}"
-                        f"?tarMemberFile={tar_member_file}"
-                        f"&offset={self._tar_indexes[tar_member_file]['offset']}"
-                        f"&size={self._tar_indexes[tar_member_file]['size']}"
-                    )
-                    break
+        # Members may sit in a directory inside the tar, hrefs are matched by basename
+        tar_members_by_basename = {
+            tar_member_file.rsplit("/", 1)[-1]: tar_member_file for tar_member_file in self._tar_indexes
+        }
+
+        for asset in self._stac_json_dict["assets"].values():
+            asset.pop("alternate", None)
+            asset.pop("file:checksum", None)
+
+            tar_member_file = tar_members_by_basename.get(asset["href"].rsplit("/", 1)[-1])
+            if tar_member_file is None:
+                # Fallback for hrefs not ending with the member name
+                tar_member_file = next(
+                    (member for member in self._tar_indexes if member in asset["href"]),
+                    None
+                )
+
+            if tar_member_file is not None:
+                tar_member_index = self._tar_indexes[tar_member_file]
+                asset["href"] = self._asset_href_template % (
+                    tar_member_file, tar_member_index["offset"], tar_member_index["size"]
+                )
 
         self._stac_json_dict["assets"].update(
             {
                 "tar": {
-                    "href": f"{env.get_landsat()["stac_asset_download_root"]}{self._dataset}/{self._tar_path.name}",
+                    "href": self._asset_href_prefix,
                     "title": "Full tar file",
                     "description": "Full tar file as published by USGS",
                     "type": "application/x-tar",
@@ -141,16 +149,22 @@ class LandsatProcessor:
             }
         )
 
-        stac_filename = Path(f"{Path(self._tar_path.parent) / self._stac_json_dict['id']}_stac.json")
-        with open(stac_filename, "w") as f:
-            json.dump(self._stac_json_dict, f, indent=4)
+        return self._write_stac_json()
+
+    def _write_stac_json(self) -> Path:
+        # Compact JSON, the file is only uploaded to storage, never read by humans directly
+        stac_filename = self._tar_path.parent / f"{self._stac_json_dict['id']}_stac.json"
+        stac_filename.write_bytes(orjson.dumps(self._stac_json_dict))
 
         return stac_filename
 
-    def _untar_mtl_from_product(self, type: MTL_TYPE) -> Path:
-        tar_members = self._landsat_tar_utils.get_members()
+    def _read_mtl_from_product(self, type: MTL_TYPE) -> bytes:
+        if self._tar_metadata_files is None:
+            self._scan_tar()
 
-        mtl_files = [m for m in tar_members if m.name.endswith(type.value)]
+        mtl_files = [
+            contents for name, contents in self._tar_metadata_files.items() if name.endswith(type.value)
+        ]
 
         if len(mtl_files) != 1:
             raise LandsatTarFileUnexpectedContents(
@@ -158,56 +172,35 @@ class LandsatProcessor:
                 additional_info=f"Found {len(mtl_files)} MTL files!"
             )
 
-        mtl_member_file = mtl_files[0]
-
-        metadata_file_path: Path = self._landsat_tar_utils.untar_member(
-            member=mtl_member_file,
-        )
-
-        return metadata_file_path
+        return mtl_files[0]
 
     def _populate_stac_item(self, metadata_dict: dict):
-        stac_template_path = Path(__file__).resolve().parent / "stac_templates" / "[feature]landsat.json"
-        with stac_template_path.open("r", encoding="utf-8") as stac_template_file:
-            stac_json_dict = json.load(stac_template_file)
+        stac_json_dict = orjson.loads(_STAC_TEMPLATE_BYTES)
+
+        product_contents = metadata_dict["LANDSAT_METADATA_FILE"]["PRODUCT_CONTENTS"]
+        image_attributes = metadata_dict["LANDSAT_METADATA_FILE"]["IMAGE_ATTRIBUTES"]
+        projection_attributes = metadata_dict["LANDSAT_METADATA_FILE"]["PROJECTION_ATTRIBUTES"]
 
         stac_json_dict["features"][0]["properties"]["temporary"] = True
 
-        stac_json_dict["features"][0]["id"] = (
-            metadata_dict["LANDSAT_METADATA_FILE"]["PRODUCT_CONTENTS"]["LANDSAT_PRODUCT_ID"]
-        )
+        stac_json_dict["features"][0]["id"] = product_contents["LANDSAT_PRODUCT_ID"]
 
         stac_json_dict["features"][0]["collection"] = self._dataset
 
-        datetime = (
-                metadata_dict["LANDSAT_METADATA_FILE"]["IMAGE_ATTRIBUTES"]["DATE_ACQUIRED"] +
-                "T" +
-                metadata_dict["LANDSAT_METADATA_FILE"]["IMAGE_ATTRIBUTES"]["SCENE_CENTER_TIME"]
-        )
+        datetime = f"{image_attributes["DATE_ACQUIRED"]}T{image_attributes["SCENE_CENTER_TIME"]}"
         stac_json_dict["features"][0]["properties"]["start_datetime"] = datetime
         stac_json_dict["features"][0]["properties"]["end_datetime"] = datetime
         stac_json_dict["features"][0]["properties"]["datetime"] = datetime
 
-        corners_lats = [
-            float(metadata_dict["LANDSAT_METADATA_FILE"]["PROJECTION_ATTRIBUTES"]["CORNER_UL_LAT_PRODUCT"]),
-            float(metadata_dict["LANDSAT_METADATA_FILE"]["PROJECTION_ATTRIBUTES"]["CORNER_UR_LAT_PRODUCT"]),
-            float(metadata_dict["LANDSAT_METADATA_FILE"]["PROJECTION_ATTRIBUTES"]["CORNER_LL_LAT_PRODUCT"]),
-            float(metadata_dict["LANDSAT_METADATA_FILE"]["PROJECTION_ATTRIBUTES"]["CORNER_LR_LAT_PRODUCT"]),
-        ]
+        west = south = math.inf
+        east = north = -math.inf
+        for corner in ("UL", "UR", "LL", "LR"):
+            lat = float(projection_attributes[f"CORNER_{corner}_LAT_PRODUCT"])
+            lon = float(projection_attributes[f"CORNER_{corner}_LON_PRODUCT"])
+            west, east = min(west, lon), max(east, lon)
+            south, north = min(south, lat), max(north, lat)
 
-        corners_lons = [
-            float(metadata_dict["LANDSAT_METADATA_FILE"]["PROJECTION_ATTRIBUTES"]["CORNER_UL_LON_PRODUCT"]),
-            float(metadata_dict["LANDSAT_METADATA_FILE"]["PROJECTION_ATTRIBUTES"]["CORNER_UR_LON_PRODUCT"]),
-            float(metadata_dict["LANDSAT_METADATA_FILE"]["PROJECTION_ATTRIBUTES"]["CORNER_LL_LON_PRODUCT"]),
-            float(metadata_dict["LANDSAT_METADATA_FILE"]["PROJECTION_ATTRIBUTES"]["CORNER_LR_LON_PRODUCT"]),
-        ]
-
-        bbox = [
-            min(corners_lons),  # WEST
-            min(corners_lats),  # SOUTH
-            max(corners_lons),  # EAST
-            max(corners_lats),  # NORTH
-        ]
+        bbox = [west, south, east, north]
         stac_json_dict["features"][0]["bbox"] = bbox
 
         polygon = [[
@@ -222,7 +215,7 @@ class LandsatProcessor:
         stac_json_dict["features"][0]["assets"].update(
             {
                 "tar": {
-                    "href": f"{env.get_landsat()["stac_asset_download_root"]}{self._dataset}/{self._tar_path.name}",
+                    "href": self._asset_href_prefix,
                     "title": "Full tar file",
                     "description": "Full tar file as published by USGS",
                     "type": "application/x-tar",
@@ -234,32 +227,24 @@ class LandsatProcessor:
         return stac_json_dict
 
     def _generate_stac_item(self) -> Path:
-        metadata_file_path: Path = self._untar_mtl_from_product(type=MTL_TYPE.XML)
-        try:
-            with metadata_file_path.open("r", encoding="utf-8") as metadata_file:
-                metadata_dict = xmltodict.parse(metadata_file.read())
-        finally:
-            if metadata_file_path.exists():
-                metadata_file_path.unlink(missing_ok=True)
+        # Only element text is used, attributes are skipped
+        metadata_dict = xmltodict.parse(self._read_mtl_from_product(type=MTL_TYPE.XML), xml_attribs=False)
 
         stac_dict = self._populate_stac_item(metadata_dict=metadata_dict)
         self._stac_json_dict = stac_dict["features"][0]
 
-        stac_filename = Path(f"{Path(self._tar_path.parent) / self._stac_json_dict['id']}_stac.json")
-        with open(stac_filename, "w") as f:
-            json.dump(self._stac_json_dict, f, indent=4)
+        return self._write_stac_json()
 
-        return stac_filename
-
-    def process_landsat_tar(self) -> Tuple[Path, bool]:
+    def process_landsat_tar(self) -> Tuple[Path, bool, dict]:
         try:
             self._landsat_tar_utils = LandsatTarUtils(self._tar_path)
+            self._scan_tar()
 
             path_to_stac = self._process_pregenerated_stac()
 
             self._logger.info(f"Success {self._tar_path.name}")
 
-            return path_to_stac, True
+            return path_to_stac, True, self._stac_json_dict
 
         except LandsatTarDoesNotContainStacFile as e:
             self._logger.warning(
@@ -268,4 +253,8 @@ class LandsatProcessor:
 
             path_to_stac = self._generate_stac_item()
 
-            return path_to_stac, False
+            return path_to_stac, False, self._stac_json_dict
+
+        finally:
+            if self._landsat_tar_utils is not None:
+                self._landsat_tar_utils.close()
@@ -1,22 +1,56 @@
+import io
+import logging
+import os
 import tarfile
 from tarfile import TarInfo
+from typing import IO, Callable
 
 from .exceptions.landsat_tar_utils import *
 
+from env import env
+
 
 class LandsatTarUtils:
     _tar_file_path: Path
+    _tar: tarfile.TarFile | None = None
+    _members: list[TarInfo] | None = None
 
-    def __init__(self, tar_file_object: Path):
+    def __init__(self, tar_file_object: Path, logger: logging.Logger = logging.getLogger(env.get_app__name())):
         if tar_file_object is None:
             raise TarObjectNotSpecifiedException()
         if not tar_file_object.exists():
             raise FileNotFoundError(f"Tar file not found: {tar_file_object}")
         self._tar_file_path = tar_file_object
 
+        self._logger = logger
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def __del__(self):
+        self.close()
+
+    def close(self):
+        if self._tar is not None:
+            self._tar.close()
+            self._tar = None
+
+    def _get_tar(self) -> tarfile.TarFile:
+        # Archive is opened lazily once and shared by all member reads
+        if self._tar is None:
+            self._tar = tarfile.open(self._tar_file_path, mode="r")
+
+        return self._tar
+
     def get_members(self) -> list[TarInfo]:
-        with tarfile.open(self._tar_file_path, mode="r") as tar_file:
-            return tar_file.getmembers()
+        # Tar headers are walked only once, index and member lookups reuse them
+        if self._members is None:
+            self._members = self._get_tar().getmembers()
+
+        return self._members
 
     def untar_member(self, member: tarfile.TarInfo, untar_dir: Path = None) -> Path:
         if untar_dir is None:
@@ -32,22 +66,73 @@ class LandsatTarUtils:
 
         untar_path.parent.mkdir(parents=True, exist_ok=True)
 
-        with tarfile.open(self._tar_file_path, "r") as tar:
-            with tar.extractfile(member) as src, open(untar_path, "wb") as dst:
-                dst.write(src.read())
+        with self.open_member(member) as src, open(untar_path, "wb") as dst:
+            dst.write(src.read())
 
         return untar_path
 
+    def open_member(self, member: tarfile.TarInfo) -> IO[bytes]:
+        return self._get_tar().extractfile(member)
+
+    def read_member_bytes(self, member: tarfile.TarInfo) -> bytes:
+        tar = self._get_tar()
+
+        # Uncompressed tar: member data is contiguous, read it with positional reads on the raw fd
+        if member.isreg() and not member.issparse() and isinstance(tar.fileobj, io.BufferedReader):
+            return self._pread(tar.fileobj.fileno(), member.offset_data, member.size)
+
+        with self.open_member(member) as src:
+            return src.read()
+
+    @staticmethod
+    def _pread(fd: int, offset: int, size: int) -> bytes:
+        chunks = []
+        while size > 0:
+            chunk = os.pread(fd, size, offset)
+            if not chunk:
+                raise EOFError(f"Unexpected end of tar file at offset {offset}")
+            chunks.append(chunk)
+            offset += len(chunk)
+            size -= len(chunk)
+
+        return b"".join(chunks)
+
+    def scan(self, extract_predicate: Callable[[TarInfo], bool]) -> tuple[dict[str, dict[str, int]], dict[str, bytes]]:
+        """
+        Single pass over the tar building the member index and reading contents of members
+        matching extract_predicate while the archive is positioned at them.
+        """
+
+        index: dict[str, dict[str, int]] = {}
+        extracted: dict[str, bytes] = {}
+
+        tar = self._get_tar()
+        for member in tar:
+            if not member.isfile():
+                continue
+
+            index[member.name] = {
+                "offset": member.offset_data,
+                "size": member.size,
+            }
+
+            if extract_predicate(member):
+                extracted[member.name] = self.read_member_bytes(member)
+
+        # Iteration loaded all headers, keep them for later member lookups
+        self._members = tar.getmembers()
+
+        return index, extracted
+
     def build_index(self) -> dict[str, dict[str, int]]:
         index: dict[str, dict[str, int]] = {}
 
-        with tarfile.open(self._tar_file_path, mode="r") as tar_file:
-            print(f"Building index for {self._tar_file_path.name}")
-            for member in tar_file:
-                if member.isfile():
-                    index[member.name] = {
-                        "offset": member.offset_data,
-                        "size": member.size,
-                    }
+        self._logger.debug("Building index for %s", self._tar_file_path.name)
+        for member in self.get_members():
+            if member.isfile():
+                index[member.name] = {
+                    "offset": member.offset_data,
+                    "size": member.size,
+                }
 
         return index
@@ -1,6 +1,9 @@
-import json
 import logging
 
+import orjson
+
+from concurrent.futures import ThreadPoolExecutor, wait
+from contextlib import suppress
 from datetime import date, datetime, timedelta, timezone
 from tempfile import NamedTemporaryFile
 from typing import Any, List, Tuple
@@ -37,6 +40,19 @@ class LandsatWorker(USGSWorker):
 
         self._items_missing_usgs_stac_filename: str = f"{self.get_dataset()}/items_missing_usgs_stac.json"
 
+        # Display IDs waiting to be merged into the remote missing USGS STAC list
+        self._items_missing_usgs_stac_pending: set[str] = set()
+
+        # Uploads of a processed product (STAC JSON, tar) run in parallel
+        self._upload_executor = ThreadPoolExecutor(max_workers=4)
+
+    def close(self):
+        upload_executor = getattr(self, "_upload_executor", None)
+        if upload_executor is not None:
+            upload_executor.shutdown(wait=True)
+
+        super().close()
+
     def get_catalogue_download_host(self) -> str:
         return env.get_landsat()["stac_asset_download_root"]
 
@@ -60,28 +76,26 @@ class LandsatWorker(USGSWorker):
 
         return days_to_download
 
-    def _get_items_missing_usgs_stac(self) -> List[str]:
+    def _download_items_missing_usgs_stac(self) -> List[str]:
+        """
+        Downloads the missing USGS STAC list, caller is expected to hold its storage lock
+        """
+
         data: List[str] = []
 
-        with self._storage.locked(self._items_missing_usgs_stac_filename):
-            try:
-                with NamedTemporaryFile(mode='w+b', suffix='.json', delete=False) as tmp_file:
-                    try:
-                        self._storage.download(remote_file_path=self._items_missing_usgs_stac_filename,
-                                               local_file_path=tmp_file.name)
-                        tmp_file.seek(0)
-                        data = json.load(tmp_file)
+        # Read straight into memory, the download replaces the target file so an open handle would stay empty
+        with suppress(FileNotFoundError):
+            data = orjson.loads(self._storage.get_bytes(remote_file_path=self._items_missing_usgs_stac_filename))
 
-                        if not isinstance(data, list):
-                            raise ValueError(
-                                f"File {self._items_missing_usgs_stac_filename} does not contain valid list!")
+            if not isinstance(data, list):
+                raise ValueError(
+                    f"File {self._items_missing_usgs_stac_filename} does not contain valid list!")
 
-                    except FileNotFoundError:
-                        pass
+        return data
 
-            finally:
-                tmp_file.close()
-                Path(tmp_file.name).unlink(missing_ok=True)
+    def _get_items_missing_usgs_stac(self) -> List[str]:
+        with self._storage.locked(self._items_missing_usgs_stac_filename):
+            data = self._download_items_missing_usgs_stac()
 
         self._logger.info(
             f"Missing USGS generated STAC for {len(data)} files."
@@ -90,50 +104,38 @@ class LandsatWorker(USGSWorker):
         return data
 
     def _save_item_missing_usgs_stac(self, display_id: str):
-        data: List[str] = []
+        # Only remembered here, written to storage by _flush_items_missing_usgs_stac
+        self._items_missing_usgs_stac_pending.add(display_id)
 
-        with self._storage.locked(self._items_missing_usgs_stac_filename):
-            try:
-                with NamedTemporaryFile(mode='w+b', suffix='.json', delete=False) as tmp_file:
-                    try:
-                        self._storage.download(
-                            remote_file_path=self._items_missing_usgs_stac_filename,
-                            local_file_path=tmp_file.name
-                        )
-                        tmp_file.seek(0)
-                        data = json.load(tmp_file)
-
-                        if not isinstance(data, list):
-                            raise ValueError(
-                                f"File {self._items_missing_usgs_stac_filename} does not contain valid list!"
-                            )
-
-                    except FileNotFoundError:
-                        data = []
+        self._logger.info(f"Added {display_id} to missing USGS STAC list.")
 
-            finally:
-                tmp_file.close()
-                Path(tmp_file.name).unlink(missing_ok=True)
+    def _flush_items_missing_usgs_stac(self):
+        if not self._items_missing_usgs_stac_pending:
+            return
 
-        if display_id not in data:
-            data.append(display_id)
+        with self._storage.locked(self._items_missing_usgs_stac_filename):
+            data = self._download_items_missing_usgs_stac()
 
-        try:
-            with NamedTemporaryFile(mode='w+', suffix='.json', delete=False) as tmp_file:
-                json.dump(data, tmp_file)
-                tmp_file.flush()
+            known = set(data)
+            data.extend(sorted(self._items_missing_usgs_stac_pending - known))
+
+            try:
+                with NamedTemporaryFile(mode='w+b', suffix='.json', delete=False) as tmp_file:
+                    tmp_file.write(orjson.dumps(data))
+                    tmp_file.flush()
 
-                with self._storage.locked(self._items_missing_usgs_stac_filename):
                     self._storage.upload(
                         local_file_path=tmp_file.name,
                         remote_file_path=self._items_missing_usgs_stac_filename
                     )
 
-        finally:
-            tmp_file.close()
-            Path(tmp_file.name).unlink(missing_ok=True)
+            finally:
+                tmp_file.close()
+                Path(tmp_file.name).unlink(missing_ok=True)
+
+        self._items_missing_usgs_stac_pending.clear()
 
-        self._logger.info(f"Added {display_id} to missing USGS STAC list ({len(data)} total).")
+        self._logger.info(f"Saved missing USGS STAC list ({len(data)} total).")
 
     def run(self, **kwargs):
         self._logger.debug(f"{self._dataset} pipeline started")
@@ -144,23 +146,30 @@ class LandsatWorker(USGSWorker):
 
         items_missing_usgs_stac: List[str] = self._get_items_missing_usgs_stac()
 
-        for day_to_download in days_to_download:
-            day, force_redownload = day_to_download
+        try:
+            for day_to_download in days_to_download:
+                day, force_redownload = day_to_download
+
+                self._logger.info(f"[{day:%Y-%m-%d}] Start processing")
+
+                self._process_day(day, force_redownload)
 
-            self._logger.info(f"[{day:%Y-%m-%d}] Start processing")
+                # Flushed per day before the day is marked done, so a crash never loses its missing items
+                self._flush_items_missing_usgs_stac()
 
-            self._process_day(day, force_redownload)
+                self._set_last_downloaded_day(day)
 
-            self._set_last_downloaded_day(day)
+                self._logger.info(f"[{day:%Y-%m-%d}] Finished processing")
 
-            self._logger.info(f"[{day:%Y-%m-%d}] Finished processing")
+                self.reset_run_attempt()
 
-            self.reset_run_attempt()
+            for item_missing_usgs_stac in items_missing_usgs_stac:
+                self._logger.info(f"[{item_missing_usgs_stac}] Started processing]")
 
-        for item_missing_usgs_stac in items_missing_usgs_stac:
-            self._logger.info(f"[{item_missing_usgs_stac}] Started processing]")
+                self._process_item(item_missing_usgs_stac)
 
-            self._process_item(item_missing_usgs_stac)
+        finally:
+            self._flush_items_missing_usgs_stac()
 
         self._logger.info("All downloaded, no more data available.")
 
@@ -170,20 +179,28 @@ class LandsatWorker(USGSWorker):
             landsat_tar_path=landsat_tar_path,
         )
 
-        path_to_stac_file, pregenerated_stac = landsat_processor.process_landsat_tar()
+        path_to_stac_file, pregenerated_stac, stac_json_dict = landsat_processor.process_landsat_tar()
 
         if not pregenerated_stac:
             self._save_item_missing_usgs_stac(display_id=landsat_tar_path.stem)
 
-        with open(path_to_stac_file, "r") as stac_file:
-            json_data = json.load(stac_file)
-            self._catalogue.register_item(dataset=self._dataset, json_data=json_data)
-
-        self._save_to_storage(
+        # Only the STAC JSON upload overlaps the registration
+        stac_upload_future = self._upload_executor.submit(
+            self._save_to_storage,
             file_to_save=path_to_stac_file,
             remote_path=f"{self.get_dataset()}/{path_to_stac_file.name}"
         )
 
+        try:
+            self._catalogue.register_item(dataset=self._dataset, json_data=stac_json_dict)
+
+        finally:
+            # Files live in a temporary dir removed after this call, the upload has to finish first
+            wait([stac_upload_future])
+
+        stac_upload_future.result()
+
+        # Stored tar marks the item as done, so it is uploaded only once the item is registered
         self._save_to_storage(
             file_to_save=landsat_tar_path,
             remote_path=f"{self.get_dataset()}/{landsat_tar_path.name}"
@@ -1,12 +1,18 @@
 import httpx
-import json
 import logging
 import os
 import random
 import re
+import statistics
+import threading
 import time
 
-from datetime import datetime, timedelta, timezone
+import orjson
+
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+from email.message import Message
 from pathlib import Path
 from typing import Dict, List, Tuple
 from urllib.parse import urlparse
@@ -14,6 +20,22 @@ from urllib.parse import urlparse
 from env import env
 from .exceptions.usgs_m2m_connector import *
 
+_M2M_API_URL: str = env.get_landsat()['m2m_api_url']
+_M2M_USERNAME: str = env.get_landsat()['m2m_username']
+_M2M_TOKEN: str = env.get_landsat()['m2m_token']
+_M2M_SCENE_LABEL: str = env.get_landsat()['m2m_scene_label']
+_M2M_POLL_BACKOFF_MIN: float = env.get_landsat()['m2m_poll_backoff_min']
+_M2M_POLL_BACKOFF_MAX: float = env.get_landsat()['m2m_poll_backoff_max']
+_M2M_POLL_BACKOFF_BASE: float = env.get_landsat()['m2m_poll_backoff_base']
+
+# Supported download systems, lower value is preferred when an entity is offered by more of them
+_SUPPORTED_DOWNLOAD_SYSTEMS: Dict[str, int] = {'ls_zip': 0, 'dds_ms': 1, 'dds': 2}
+
+# HTTP statuses of transient failures, requests ending with them are retried
+_RETRYABLE_STATUS_CODES: frozenset[int] = frozenset({408, 425, 429, 500, 502, 503, 504})
+
+_CONTENT_RANGE_SIZE_RE: re.Pattern = re.compile(r"/(\d+)$")
+
 
 class USGSM2MConnector:
     """
@@ -29,15 +51,51 @@ class USGSM2MConnector:
     _scene_label: str = None
     _login_token: str = None
     _api_token: str | None = None
-    _api_token_valid_until: datetime = datetime.now(timezone.utc)
+    # Headers of authenticated requests, rebuilt only when a new token is obtained
+    _auth_headers: dict = {}
+    _api_token_deadline: float = 0.0  # time.monotonic() value
+
+    # Tokens shared by all connectors of the process, (api_url, username) -> (token, deadline)
+    # Lock prevents parallel logins, also across connectors of different datasets
+    _api_token_cache: Dict[Tuple[str, str], Tuple[str, float]] = {}
+    _login_lock: threading.Lock = threading.Lock()
+
+    # Maximum number of download-request calls in flight at once
+    _download_request_workers: int = 16
+
+    # Number of downloads sent in a single download-request call
+    _download_request_batch_size: int = 100
+
+    # Exponential backoff of the wait between polls for preparing downloads (seconds)
+    _download_request_min_wait: float = _M2M_POLL_BACKOFF_MIN
+    _download_request_max_wait: float = _M2M_POLL_BACKOFF_MAX
+    _download_request_backoff_base: float = _M2M_POLL_BACKOFF_BASE
+
+    # Upper bound of the whole wait for preparing downloads (seconds)
+    _download_request_timeout: float = 2 * 3600
+
+    # Scene search is paged so whole result set is not parsed at once
+    _scene_search_page_size: int = 1000
+    _scene_search_max_results: int = 10000
+
+    # Number of recent download preparation times the first poll delay is derived from
+    _preparation_times_size: int = 256
+    _preparation_times_min_samples: int = 8
+
+    # Connection attempts retried by the httpx transport before a request fails
+    _connect_retries: int = 3
+
+    # Bounds of the decorrelated jitter delay between retried requests (seconds)
+    _retry_base_delay: float = 1.0
+    _retry_max_delay: float = 30.0
 
     def __init__(
             self,
             dataset: str = None,
-            api_url: str = env.get_landsat()['m2m_api_url'],
-            username: str = env.get_landsat()['m2m_username'],
-            login_token: str = env.get_landsat()['m2m_token'],
-            scene_label: str = env.get_landsat()['m2m_scene_label'],
+            api_url: str = _M2M_API_URL,
+            username: str = _M2M_USERNAME,
+            login_token: str = _M2M_TOKEN,
+            scene_label: str = _M2M_SCENE_LABEL,
             logger: logging.Logger = logging.getLogger(env.get_app__name()),
     ):
         if dataset is None:
@@ -45,29 +103,80 @@ class USGSM2MConnector:
 
         self._dataset = dataset
 
-        self._api_url = api_url
+        # Normalized with trailing slash so endpoints are simply appended
+        self._api_url = api_url.rstrip('/') + '/'
         self._username = username
         self._login_token = login_token
         self._scene_label = f"{scene_label}__{self._dataset}"
 
         self._logger = logger
 
+        # Pooled client shared by all M2M API requests, keeps connections alive between calls
+        # Failed connection attempts are retried by the transport on the spot,
+        # _retry_request only handles errors of established requests and 5xx responses
+        # HTTP/2 lets parallel download-request calls share a single TLS connection
+        self._client = httpx.Client(
+            headers={"Content-Type": "application/json"},
+            transport=httpx.HTTPTransport(
+                http2=True,
+                retries=self._connect_retries,
+                limits=httpx.Limits(max_connections=16, max_keepalive_connections=16),
+            ),
+        )
+
+        # Seconds USGS needed to prepare recent downloads (request -> available)
+        self._preparation_times: deque[float] = deque(maxlen=self._preparation_times_size)
+
+        # Separate pooled client for file size probes and downloads, those follow redirects to the data hosts
+        self._download_client = httpx.Client(
+            follow_redirects=True,
+            transport=httpx.HTTPTransport(retries=self._connect_retries),
+        )
+
         # self._login_token()
         # Set token as expired so first call will force login
-        self._api_token_valid_until = datetime.now(timezone.utc)
+        self._api_token_deadline = time.monotonic()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def __del__(self):
+        self.close()
+
+    def close(self):
+        """
+        Closes the pooled HTTP clients
+        """
+
+        for client in (getattr(self, "_client", None), getattr(self, "_download_client", None)):
+            if client is not None and not client.is_closed:
+                client.close()
 
     def _login_using_token(self):
         """
         Obtains the M2M API access token using the user's username and login token.
         """
 
+        with self._login_lock:
+            # Threads waiting on the lock reuse the token obtained by the thread which logged in first
+            if not self._is_token_expired():
+                return
+
+            self._login_using_token_locked()
+
+    def _login_using_token_locked(self):
         if not self._username or not self._login_token:
             raise USGSM2MCredentialsNotProvided()
 
-        self._api_token = None
-
-        # Set expiration to 2 hours
-        self._api_token_valid_until = datetime.now(timezone.utc) + timedelta(hours=2)
+        # Another connector may have logged in already, its token is reused until it expires
+        cache_key = (self._api_url, self._username)
+        cached_token, cached_deadline = self._api_token_cache.get(cache_key, (None, 0.0))
+        if cached_token is not None and time.monotonic() < cached_deadline:
+            self._set_api_token(cached_token, cached_deadline)
+            return
 
         api_payload = {
             "username": self._username,
@@ -80,12 +189,17 @@ class USGSM2MConnector:
         for attempt in range(1, max_attempts + 1):
             try:
                 response_content = self._send_request("login-token", api_payload)
-                response_data = json.loads(response_content)
-                self._api_token = response_data.get("data")
+                response_data = orjson.loads(response_content)
+                api_token = response_data.get("data")
 
-                if not self._api_token:
+                if not api_token:
                     raise USGSM2MTokenNotObtainedException()
 
+                # Old token keeps being used by other threads until the new one is obtained
+                # Set expiration to 2 hours, minus 5 minutes safety margin
+                self._set_api_token(api_token, time.monotonic() + 2 * 3600 - 300)
+                self._api_token_cache[cache_key] = (api_token, self._api_token_deadline)
+
                 self._logger.info("Successfully obtained M2M API access token.")
                 return
 
@@ -117,21 +231,26 @@ class USGSM2MConnector:
             response_text=f"Exceeded retry limit ({max_attempts}) after rate limiting or server errors"
         )
 
+    def _set_api_token(self, api_token: str, deadline: float):
+        self._api_token = api_token
+        self._auth_headers = {"X-Auth-Token": api_token}
+        self._api_token_deadline = deadline
+
     def _refresh_token_if_expired_or_missin(self):
         """
         Refreshes the API token if expired
         """
 
-        if (
-                (self._api_token_valid_until < datetime.now(timezone.utc))
-                or
-                (self._api_token is None)
-        ):
+        if self._is_token_expired():
             self._login_using_token()
 
+    def _is_token_expired(self) -> bool:
+        return self._api_token is None or time.monotonic() > self._api_token_deadline
+
     def _scene_search(
             self,
-            geojson: dict, datetime_start: datetime, datetime_end: datetime, max_results: int = 10000
+            geojson: dict, datetime_start: datetime, datetime_end: datetime, max_results: int = 10000,
+            starting_number: int = 1
     ) -> Dict:
         """
         Searches for relevant scenes for a given dataset, GeoJSON polygon, and date range.
@@ -140,6 +259,7 @@ class USGSM2MConnector:
 
         api_payload = {
             "maxResults": max_results,
+            "startingNumber": starting_number,
             "datasetName": self._dataset,
             "sceneFilter": {
                 "spatialFilter": {
@@ -154,9 +274,38 @@ class USGSM2MConnector:
         }
 
         response_content = self._send_request('scene-search', api_payload)
-        scenes = json.loads(response_content)
+        scenes = orjson.loads(response_content)
         return scenes.get('data', {})
 
+    def _scene_search_entity_display_ids(
+            self, geojson: dict, datetime_start: datetime, datetime_end: datetime
+    ) -> Tuple[Dict[str, str], int]:
+        """
+        Searches scenes page by page and returns mapping of entity IDs to display IDs together with total hits.
+        Only entity and display IDs of each page are kept, so full search results never sit in memory at once.
+        """
+
+        entity_display_ids: Dict[str, str] = {}
+        total_hits = 0
+        starting_number = 1
+
+        while len(entity_display_ids) < self._scene_search_max_results:
+            page_size = min(self._scene_search_page_size, self._scene_search_max_results - len(entity_display_ids))
+            scenes = self._scene_search(
+                geojson, datetime_start, datetime_end, max_results=page_size, starting_number=starting_number
+            )
+
+            total_hits = scenes.get('totalHits', 0)
+            results = scenes.get('results') or []
+
+            entity_display_ids.update({result['entityId']: result['displayId'] for result in results})
+
+            starting_number += len(results)
+            if len(results) < page_size or starting_number > total_hits:
+                break
+
+        return entity_display_ids, total_hits
+
     def _scene_list_add(self, entity_ids: List[str]):
         """
         Adds scenes to a scene list defined by a label in the M2M API.
@@ -199,25 +348,30 @@ class USGSM2MConnector:
         }
 
         response_content = self._send_request('download-options', api_payload)
-        download_options = json.loads(response_content)
+        download_options = orjson.loads(response_content)
 
         # Filter for available downloads from specific download systems.
-        supported_systems = ['dds', 'dds_ms', 'ls_zip']
-        filtered_options = [
-            download_option for download_option in download_options.get('data', []) \
-            if download_option.get('available') and download_option.get('downloadSystem') in supported_systems
-        ]
+        # Each entity is requested only once, from the preferred download system,
+        # _download_request pairs available downloads with options by entity ID
+        options_by_entity: Dict[str, Dict] = {}
+        for download_option in download_options.get('data', []):
+            download_system = download_option.get('downloadSystem')
+            if not download_option.get('available') or download_system not in _SUPPORTED_DOWNLOAD_SYSTEMS:
+                continue
 
-        self._logger.info(f"Found {len(filtered_options)} valid download options.")
+            chosen_option = options_by_entity.get(download_option['entityId'])
+            if (
+                    chosen_option is None
+                    or _SUPPORTED_DOWNLOAD_SYSTEMS[download_system]
+                    < _SUPPORTED_DOWNLOAD_SYSTEMS[chosen_option['downloadSystem']]
+            ):
+                options_by_entity[download_option['entityId']] = download_option
 
-        return filtered_options
+        filtered_options = list(options_by_entity.values())
 
-    def _unique_urls(self, available_urls: List[Dict]) -> List[Dict]:
-        """
-        Removes duplicate URLs from a list of download dictionaries.
-        """
+        self._logger.info(f"Found {len(filtered_options)} valid download options.")
 
-        return list({url_dict['url']: url_dict for url_dict in available_urls}.values())
+        return filtered_options
 
     def _download_request(self, download_options: List[Dict]) -> List[Dict]:
         """
@@ -226,52 +380,123 @@ class USGSM2MConnector:
         """
 
         available_urls = []
-        options_to_process = download_options[:]
-
-        while options_to_process:
-            preparing_urls = []
-
-            for option in options_to_process:
-                api_payload = {
-                    "downloads": [
-                        {
-                            "entityId": option['entityId'],
-                            "productId": option['id']
-                        }
-                    ]
-                }
+        seen_urls = set()
+        options_by_entity = {option['entityId']: option for option in download_options}
+        preparing_entity_ids = set()
+
+        def add_available_download(available_download: Dict):
+            # Skip duplicate URLs
+            url = available_download['url']
+            if url in seen_urls:
+                return
+            seen_urls.add(url)
+
+            option = options_by_entity.get(available_download.get('entityId'), {})
+            available_urls.append({
+                "entityId": available_download.get('entityId', option.get('entityId')),
+                "productId": option.get('id', available_download.get('productId')),
+                "url": url,
+            })
+
+        batches = [
+            download_options[i:i + self._download_request_batch_size]
+            for i in range(0, len(download_options), self._download_request_batch_size)
+        ]
+
+        with ThreadPoolExecutor(
+                max_workers=max(1, min(self._download_request_workers, len(batches)))
+        ) as executor:
+            futures = {
+                executor.submit(self._request_download, batch): batch
+                for batch in batches
+            }
+
+            for future in as_completed(futures):
+                batch = futures[future]
 
                 try:
-                    response_content = self._send_request('download-request', api_payload)
-                    download_request = json.loads(response_content)
-                    available_urls.extend([
-                        {"entityId": option['entityId'], "productId": option['id'], "url": d['url']}
-                        for d in download_request['data'].get('availableDownloads', [])
-                    ])
-                    preparing_urls.extend(download_request['data'].get('preparingDownloads', []))
+                    download_request = future.result()
+
+                    for available_download in download_request['data'].get('availableDownloads', []):
+                        add_available_download(available_download)
+
+                    preparing_entity_ids.update(
+                        preparing_download['entityId']
+                        for preparing_download in download_request['data'].get('preparingDownloads', [])
+                    )
 
                 except Exception as e:
-                    self._logger.warning(f"Failed to request download for entity {option['entityId']}: {e}")
+                    self._logger.warning("Failed to request download for %d entities: %s", len(batch), e)
+
+        requested_at = time.monotonic()
+        first_poll_delay = self._first_poll_delay()
+        poll_attempt = 0
 
-            if not preparing_urls:
+        # Last poll which still saw the downloads preparing, lower bound of the preparation time of those ready next
+        previous_poll_at = requested_at
+
+        # Downloads still being prepared are polled by label instead of requesting them again
+        while preparing_entity_ids:
+            if time.monotonic() - requested_at > self._download_request_timeout:
+                self._logger.warning(
+                    "Gave up waiting for %d downloads after %.0fs", len(preparing_entity_ids), self._download_request_timeout
+                )
                 break
 
-            options_to_process = [
-                option for option in options_to_process if
-                any(prepared_url['entityId'] == option['entityId'] for prepared_url in preparing_urls)
-            ]
+            wait_seconds = self._poll_delay(poll_attempt, first_poll_delay)
+            poll_attempt += 1
 
-            self._logger.info(f"Waiting for {len(preparing_urls)} downloads to be ready...")
-            time.sleep(5)
+            self._logger.info(
+                "Waiting %.1fs for %d downloads to be ready...", wait_seconds, len(preparing_entity_ids)
+            )
+            time.sleep(wait_seconds)
+
+            polled_at = time.monotonic()
+            for available_download in self._download_retrieve().get('available', []):
+                entity_id = available_download.get('entityId')
+                if entity_id in preparing_entity_ids and available_download.get('url'):
+                    add_available_download(available_download)
+                    preparing_entity_ids.discard(entity_id)
+                    # Time of detection would include the poll overshoot and push the first poll later every run
+                    self._preparation_times.append(previous_poll_at - requested_at)
 
-        # Remove duplicates
-        unique_urls = self._unique_urls(available_urls)
-        if len(unique_urls) < len(download_options):
+            previous_poll_at = polled_at
+
+        if len(available_urls) < len(download_options):
             raise USGSM2MDownloadRequestReturnedFewerURLs(
-                entity_ids_count=len(download_options), urls_count=len(unique_urls)
+                entity_ids_count=len(download_options), urls_count=len(available_urls)
             )
 
-        return unique_urls
+        return available_urls
+
+    def _request_download(self, download_options: List[Dict]) -> Dict:
+        """
+        Sends a single download-request for a batch of download options and returns the parsed response.
+        """
+
+        api_payload = {
+            "downloads": [
+                {
+                    "entityId": option['entityId'],
+                    "productId": option['id']
+                }
+                for option in download_options
+            ],
+            "label": self._scene_label
+        }
+
+        response_content = self._send_request('download-request', api_payload)
+        return orjson.loads(response_content)
+
+    def _download_retrieve(self) -> Dict:
+        """
+        Retrieves state of downloads requested under the scene label.
+        """
+
+        api_payload = {"label": self._scene_label}
+
+        response_content = self._send_request('download-retrieve', api_payload)
+        return orjson.loads(response_content).get('data') or {}
 
     def _get_list_of_files(
             self,
@@ -303,17 +528,17 @@ class USGSM2MConnector:
         Main public method to get a list of downloadable files and their metadata.
         """
 
-        self.scene_list_remove()
-        scenes = self._scene_search(geojson, time_start, time_end)
+        entity_display_ids, total_hits = self._scene_search_entity_display_ids(geojson, time_start, time_end)
 
-        if not scenes.get('results'):
+        if not entity_display_ids:
             self._logger.info("No scenes found for the specified criteria.")
             return []
 
-        entity_display_ids = {result['entityId']: result['displayId'] for result in scenes['results']}
+        # Scene list is cleared only when it is about to be populated again
+        self.scene_list_remove()
 
         self._logger.info(
-            f"Total hits: {scenes.get('totalHits', 0)}, records returned: {scenes.get('recordsReturned', 0)}"
+            f"Total hits: {total_hits}, records returned: {len(entity_display_ids)}"
         )
 
         self._scene_list_add(list(entity_display_ids.keys()))
@@ -334,16 +559,28 @@ class USGSM2MConnector:
     """
 
     def get_file_size(self, download_url: str, max_retries: int = 5, timeout: int = 60) -> int:
+        """
+        Returns size of the remote file in bytes, -1 if it cannot be determined.
+        HEAD request is tried first, one byte Range request is used when HEAD does not tell the length.
+        """
+
         headers = {"Range": "bytes=0-0"}
 
         for attempt in range(max_retries):
             try:
-                response = httpx.get(download_url, headers=headers, follow_redirects=True, timeout=timeout)
+                response = self._download_client.head(
+                    download_url, headers={"Accept-Encoding": "identity"}, timeout=timeout
+                )
+                size = response.headers.get("content-length")
+                if response.is_success and size is not None:
+                    return int(size)
+
+                response = self._download_client.get(download_url, headers=headers, timeout=timeout)
                 response.raise_for_status()
 
                 content_range = response.headers.get("content-range")
                 if content_range:
-                    match = re.search(r"/(\d+)$", content_range)
+                    match = _CONTENT_RANGE_SIZE_RE.search(content_range)
                     if match:
                         return int(match.group(1))
 
@@ -363,70 +600,115 @@ class USGSM2MConnector:
             self,
             download_url: str,
             output_dir: Path | str,
-            chunk_size: int = 1024 * 1024,
+            chunk_size: int = 8 * 1024 * 1024,
             max_retries: int = 5,
             timeout: int = 60
     ) -> Tuple[Path, bool]:
         """
         Downloads a file from a given URL into the specified output directory.
         The filename is determined from the server's Content-Disposition header or, if missing, from the URL itself.
+        Retries after an interrupted transfer continue from the already downloaded bytes using a Range request.
         """
 
         proper_filename = True
+        output_path: Path | None = None
 
         output_dir = Path(output_dir)
         output_dir.mkdir(parents=True, exist_ok=True)
 
         retry = 0
+        delay = self._retry_base_delay
         while retry <= max_retries:
             try:
-                with httpx.stream("GET", download_url, follow_redirects=True, timeout=timeout) as response:
-                    response.raise_for_status()
+                resume_from = output_path.stat().st_size if output_path is not None and output_path.exists() else 0
+                # Identity encoding so the raw stream is the file itself and needs no decoding
+                headers = {"Accept-Encoding": "identity"}
+                if resume_from:
+                    headers["Range"] = f"bytes={resume_from}-"
+
+                with self._download_client.stream("GET", download_url, headers=headers, timeout=timeout) as response:
+                    if resume_from and response.status_code == 416:
+                        # Partial file does not fit the remote one anymore, start over
+                        output_path.unlink(missing_ok=True)
+                        continue
 
-                    cd = response.headers.get("content-disposition")
-                    filename = None
-                    if cd:
-                        match = re.search(r'filename\*?=(?:UTF-8\'\')?"?([^";]+)"?', cd, re.IGNORECASE)
-                        if match:
-                            filename = match.group(1)
-
-                    if not filename:
-                        proper_filename = False
-                        path = Path(urlparse(download_url).path)
-                        if path.name:
-                            filename = path.name
+                    response.raise_for_status()
 
-                    if not filename:
-                        proper_filename = False
-                        filename = "downloaded_file"
+                    if output_path is None:
+                        filename, proper_filename = self._get_download_filename(response, download_url)
+                        output_path = output_dir / filename
 
-                    output_path = output_dir / filename
+                    # Server may ignore Range and send whole file (200), then it is rewritten from the start
+                    resumed = bool(resume_from) and response.status_code == 206
 
-                    self._logger.info(f"Downloading {download_url} into {output_path}")
+                    if resumed:
+                        self._logger.info("Resuming download of %s from byte %d", output_path, resume_from)
+                    else:
+                        self._logger.info("Downloading %s into %s", download_url, output_path)
 
-                    with output_path.open("wb") as f:
-                        for chunk in response.iter_bytes(chunk_size=chunk_size):
-                            f.write(chunk)
+                    # Unbuffered writes of large chunks, Python file buffering only adds a copy here
+                    fd = os.open(
+                        output_path, os.O_WRONLY | os.O_CREAT | (os.O_APPEND if resumed else os.O_TRUNC), 0o644
+                    )
+                    try:
+                        for chunk in response.iter_raw(chunk_size=chunk_size):
+                            view = memoryview(chunk)
+                            while view:
+                                view = view[os.write(fd, view):]
+                    finally:
+                        os.close(fd)
 
-                self._logger.info(f"Success downloading {output_path.name}")
+                self._logger.info("Success downloading %s", output_path.name)
 
                 return output_path, proper_filename
 
             except httpx.HTTPStatusError as e:
-                self._logger.error(f"HTTP error during download: {e.response.status_code}")
+                if e.response.status_code in _RETRYABLE_STATUS_CODES and retry < max_retries:
+                    retry += 1
+                    delay = self._next_retry_delay(delay)
+                    self._logger.warning(
+                        "HTTP error %d during download, retrying in %.1fs (%d/%d)",
+                        e.response.status_code, delay, retry, max_retries
+                    )
+                    time.sleep(delay)
+                    continue
+
+                self._logger.error("HTTP error during download: %d", e.response.status_code)
                 raise
 
             except (httpx.RequestError, IOError) as e:
                 retry += 1
-                self._logger.error(f"Download failed ({retry}/{max_retries}): {e}")
+                self._logger.warning("Download failed (%d/%d): %s", retry, max_retries, e)
 
                 if retry > max_retries:
                     raise USGSM2MDownloadRequestFailed(url=download_url)
 
-                time.sleep((1 + random.random()) * 5)
+                delay = self._next_retry_delay(delay)
+                time.sleep(delay)
 
         raise USGSM2MDownloadRequestFailed(url=download_url)
 
+    @staticmethod
+    def _get_download_filename(response: httpx.Response, download_url: str) -> Tuple[str, bool]:
+        """
+        Returns filename of a download and whether it was provided by the server in Content-Disposition.
+        """
+
+        cd = response.headers.get("content-disposition")
+        if cd:
+            # Handles quoted and RFC 2231/5987 encoded (filename*=UTF-8'') parameters
+            content_disposition = Message()
+            content_disposition['content-disposition'] = cd
+            filename = Path(content_disposition.get_filename() or "").name
+            if filename:
+                return filename, True
+
+        path = Path(urlparse(download_url).path)
+        if path.name:
+            return path.name, False
+
+        return "downloaded_file", False
+
     def _send_request(self, endpoint: str, payload_dict: dict = None, max_retries: int = 5, timeout=60) -> bytes | None:
         """
         Sends an HTTP POST request to the specified M2M API endpoint using httpx.
@@ -436,51 +718,95 @@ class USGSM2MConnector:
         if payload_dict is None:
             payload_dict = {}
 
-        payload_json = json.dumps(payload_dict)
+        payload_json = orjson.dumps(payload_dict)
 
-        endpoint_full_url = os.path.join(self._api_url, endpoint)
+        endpoint_full_url = self._api_url + endpoint
 
-        headers = {}
+        headers = None
 
         # Refresh token if expired
         if endpoint not in ['login', 'login-token']:
             self._refresh_token_if_expired_or_missin()
-            headers['X-Auth-Token'] = self._api_token
+            headers = self._auth_headers
 
-        with httpx.Client(timeout=timeout) as client:
-            return self._retry_request(client, endpoint_full_url, payload_json, max_retries, headers)
+        return self._retry_request(self._client, endpoint_full_url, payload_json, max_retries, headers, timeout)
 
     def _retry_request(
-            self, client: httpx.Client, endpoint: str, payload: str, max_retries: int, headers: dict
+            self, client: httpx.Client, endpoint: str, payload: bytes, max_retries: int, headers: dict | None, timeout=60
     ) -> bytes | None:
         """
         Retries a POST request with a delay on failure.
+        Network errors and transient HTTP errors are retried, the delay follows the decorrelated jitter policy.
         """
         retry = 0
+        delay = self._retry_base_delay
 
         while retry <= max_retries:
             try:
-                payload_to_log = '=== Contains secret, not logged! ===' if 'login' in endpoint else payload
-                self._logger.info(
-                    f"Sending request to {endpoint}. Attempt: {retry + 1}/{max_retries + 1}. Payload: {payload_to_log}"
-                )
+                # Payload may be large (scene-list-add), decode it only when the record is emitted
+                if self._logger.isEnabledFor(logging.INFO):
+                    payload_to_log = '=== Contains secret, not logged! ===' if 'login' in endpoint else payload.decode()
+                    self._logger.info(
+                        "Sending request to %s. Attempt: %d/%d. Payload: %s",
+                        endpoint, retry + 1, max_retries + 1, payload_to_log
+                    )
 
-                response = client.post(endpoint, content=payload, headers=headers)
+                response = client.post(endpoint, content=payload, headers=headers, timeout=timeout)
                 response.raise_for_status()
 
                 return response.content
 
             except httpx.RequestError as e:
                 retry += 1
-                self._logger.warning(f"Request failed: {e}. Retrying...")
+                self._logger.warning("Request failed: %s. Retrying...", e)
 
                 if retry > max_retries:
                     raise USGSM2MRequestTimeout(retry=retry, max_retries=max_retries)
 
-                time.sleep((1 + random.random()) * 5)
+                delay = self._next_retry_delay(delay)
+                time.sleep(delay)
 
             except httpx.HTTPStatusError as e:
-                self._logger.error(f"Received HTTP status error {e.response.status_code}: {e.response.text}")
+                if e.response.status_code in _RETRYABLE_STATUS_CODES and retry < max_retries:
+                    retry += 1
+                    delay = self._next_retry_delay(delay)
+                    self._logger.warning(
+                        "Received HTTP status error %d, retrying in %.1fs...", e.response.status_code, delay
+                    )
+                    time.sleep(delay)
+                    continue
+
+                self._logger.error("Received HTTP status error %d: %s", e.response.status_code, e.response.text)
                 raise USGSM2MRequestNotOK(status_code=e.response.status_code, response_text=e.response.text)
 
         return None
+
+    def _first_poll_delay(self) -> float:
+        """
+        Returns delay of the first poll of preparing downloads. Once enough preparation times were observed,
+        the first poll is placed at their lower quartile so quick preparations are not polled too early.
+        """
+
+        if len(self._preparation_times) < self._preparation_times_min_samples:
+            return self._download_request_min_wait
+
+        lower_quartile = statistics.quantiles(self._preparation_times, n=4)[0]
+        return min(self._download_request_max_wait, max(self._download_request_min_wait, lower_quartile))
+
+    def _poll_delay(self, attempt: int, first_delay: float) -> float:
+        """
+        Returns delay before the next poll of preparing downloads using capped exponential backoff with jitter.
+        """
+
+        delay = min(
+            self._download_request_max_wait,
+            first_delay * (self._download_request_backoff_base ** attempt)
+        )
+        return delay * (0.5 + random.random())
+
+    def _next_retry_delay(self, previous_delay: float) -> float:
+        """
+        Returns delay before the next retry using capped decorrelated jitter.
+        """
+
+        return min(self._retry_max_delay, random.uniform(self._retry_base_delay, previous_delay * 3))
@@ -2,6 +2,8 @@ import tempfile
 import shutil
 
 from abc import ABC, abstractmethod
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import date, datetime, time
 from pathlib import Path
 from typing import Dict, List, Tuple
@@ -9,13 +11,30 @@ from typing import Dict, List, Tuple
 from .usgs_m2m_connector import USGSM2MConnector
 from .. import DatasetWorker
 
+from env import env
+
 
 class USGSWorker(DatasetWorker, ABC):
+    # Number of items downloaded at once while the others are processed
+    _download_concurrency: int = max(1, env.get_landsat()['download_concurrency'])
+
     def __init__(self, *args, **kwargs):
         super().__init__(**kwargs)
 
         self._m2m_api_connector = USGSM2MConnector(dataset=self.get_dataset())
 
+    def __del__(self):
+        self.close()
+
+    def close(self):
+        """
+        Releases connections of the M2M API connector
+        """
+
+        m2m_api_connector = getattr(self, "_m2m_api_connector", None)
+        if m2m_api_connector is not None:
+            m2m_api_connector.close()
+
     @abstractmethod
     def _process_landsat_tar(self, path_to_tar: Path):
         pass
@@ -23,33 +42,74 @@ class USGSWorker(DatasetWorker, ABC):
     def _process_day(self, day: date, force_redownload: bool):
         downloadable_files_days = self.search_by_daterange(start=day, end=day)
 
-        for file_attributes in downloadable_files_days:
-            self._logger.info(f"Will download item of displayId: {file_attributes["displayId"]}")
+        if not downloadable_files_days:
+            return
 
-            tmpdirname: str | None = None
+        # Following items are downloaded in parallel while the current one is processed and uploaded,
+        # items are still processed in order and at most _download_concurrency of them wait on disk
+        files_to_download = iter(downloadable_files_days)
+        downloads: deque[Future] = deque()
+
+        with ThreadPoolExecutor(max_workers=self._download_concurrency) as download_executor:
+            def submit_next_download():
+                file_attributes = next(files_to_download, None)
+                if file_attributes is not None:
+                    downloads.append(
+                        download_executor.submit(self._download_to_tmpdir, file_attributes, force_redownload)
+                    )
+
+            for _ in range(self._download_concurrency):
+                submit_next_download()
 
             try:
-                tmpdirname = tempfile.mkdtemp()
-                downloaded_file_path: Path = self.download(
-                    display_id=file_attributes["displayId"],
-                    download_url=file_attributes["url"],
-                    output_dir=tmpdirname,
-                    force_redownload=force_redownload
-                )
+                while downloads:
+                    tmpdirname, downloaded_file_path = downloads.popleft().result()
+
+                    submit_next_download()
 
-                if downloaded_file_path is None:
-                    pass
-                else:
-                    self._process_landsat_tar(downloaded_file_path)
+                    try:
+                        if downloaded_file_path is not None:
+                            self._process_landsat_tar(downloaded_file_path)
 
-            except Exception:
-                raise
+                    finally:
+                        self._remove_tmpdir(tmpdirname)
 
             finally:
-                try:
-                    shutil.rmtree(tmpdirname, ignore_errors=True)
-                except Exception as cleanup_err:
-                    self._logger.warning(f"Cannot delete {tmpdirname}! Error: {cleanup_err}")
+                # Do not leave prefetched items behind when processing failed
+                for download in downloads:
+                    if download.cancel():
+                        continue
+
+                    try:
+                        tmpdirname, _ = download.result()
+                        self._remove_tmpdir(tmpdirname)
+                    except Exception:
+                        pass
+
+    def _download_to_tmpdir(self, file_attributes: Dict, force_redownload: bool) -> Tuple[str, Path | None]:
+        self._logger.info(f"Will download item of displayId: {file_attributes["displayId"]}")
+
+        tmpdirname = tempfile.mkdtemp()
+
+        try:
+            downloaded_file_path: Path | None = self.download(
+                display_id=file_attributes["displayId"],
+                download_url=file_attributes["url"],
+                output_dir=tmpdirname,
+                force_redownload=force_redownload
+            )
+
+        except Exception:
+            self._remove_tmpdir(tmpdirname)
+            raise
+
+        return tmpdirname, downloaded_file_path
+
+    def _remove_tmpdir(self, tmpdirname: str):
+        try:
+            shutil.rmtree(tmpdirname, ignore_errors=True)
+        except Exception as cleanup_err:
+            self._logger.warning(f"Cannot delete {tmpdirname}! Error: {cleanup_err}")
 
     def _process_item(self, display_id: str):
         pass
@@ -69,24 +129,30 @@ class USGSWorker(DatasetWorker, ABC):
 
     def download(self, download_url: str, output_dir: str, display_id: str = "", force_redownload=False) -> Path | None:
         if not force_redownload:
-            usgs_filesize = self._m2m_api_connector.get_file_size(download_url=download_url)
-            if self._storage.exists(
-                    remote_file_path=f"{self.get_dataset()}/{display_id}.tar",
-                    expected_length=usgs_filesize
-            ):
-                self._logger.info(
-                    f"Already downloaded filesize of product {display_id} matches remote filesize ({usgs_filesize} B), "
-                    f"force_redownload={force_redownload} -> skipping."
+            # USGS is asked for the file size only when there is something stored to compare it with
+            stored_filesize = self._storage.size(remote_file_path=f"{self.get_dataset()}/{display_id}.tar")
+            if stored_filesize is not None:
+                usgs_filesize = self._m2m_api_connector.get_file_size(download_url=download_url)
+                if stored_filesize == usgs_filesize:
+                    self._logger.info(
+                        f"Already downloaded filesize of product {display_id} matches remote filesize "
+                        f"({usgs_filesize} B), force_redownload={force_redownload} -> skipping."
+                    )
+                    return None
+
+                self._logger.warning(
+                    f"Stored filesize of product {display_id} ({stored_filesize} B) "
+                    f"does not match remote filesize ({usgs_filesize} B)!"
                 )
-                return None
 
         output_file_path, proper_filename = self._m2m_api_connector.download_file(
             download_url=download_url,
             output_dir=output_dir
         )
 
-        if not proper_filename:
-            if display_id != "":
-                output_file_path.rename(output_file_path.with_name(f"{display_id}.tar"))
+        if not proper_filename and display_id != "":
+            named_file_path = output_file_path.with_name(f"{display_id}.tar")
+            if named_file_path != output_file_path:
+                output_file_path = output_file_path.replace(named_file_path)
 
         return output_file_path
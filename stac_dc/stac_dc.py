@@ -12,23 +12,20 @@ from env import env
 
 
 class STAC_DC:
-    _orchestrators: List[DatasetOrchestrator] = []
+    _orchestrators: List[DatasetOrchestrator]
 
     def __init__(
             self,
             logger: logging.Logger = logging.getLogger(env.get_app__name())
     ):
         self._logger: logging.Logger = logger
+        self._orchestrators = []
 
         self._prepare_orchestrators()
 
     def _prepare_orchestrators(self):
-        self._orchestrators = []
-
         datasets_aios = env.get_all_datasets_aios()
 
-        orchestrators: List[DatasetOrchestrator] = []
-
         for dataset, aoi in datasets_aios:
             if dataset not in workers_map:
                 raise ValueError(f"Unknown dataset '{dataset}', no corresponding worker defined!")
@@ -37,9 +34,7 @@ class STAC_DC:
                 raise ValueError(f"Unknown area of interest '{aoi}', no corresponding area of interest defined!")
 
             worker = workers_map[dataset]
-            orchestrators.append(DatasetOrchestrator(worker=worker(aoi=aois_map[aoi])))
-
-        self._orchestrators.extend(orchestrators)
+            self._orchestrators.append(DatasetOrchestrator(worker=worker(aoi=aois_map[aoi])))
 
     def run(self):
         self._logger.info(f"Starting STAC_DC with {len(self._orchestrators)} orchestrators")
@@ -14,6 +14,7 @@ class StorageCannotAcquireLock(StorageError):
 
         super().__init__(message)
 
+
 class FileNotFoundError(StorageError):
     def __init__(self, message="File not found!", file: Path | str = None):
         if file is not None:
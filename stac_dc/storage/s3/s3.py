@@ -1,8 +1,15 @@
 import boto3
+import functools
 import logging
+import threading
+import time
 
 import botocore.exceptions
 
+from boto3.s3.transfer import TransferConfig
+from botocore.config import Config
+from typing import Tuple
+
 from stac_dc.storage import Storage
 
 from env import env
@@ -11,7 +18,32 @@ from .exceptions import *
 from ..exceptions import *
 
 
+@functools.lru_cache(maxsize=8)
+def _get_s3_client(service_name: str, s3_host: str, access_key: str, secret_key: str):
+    """
+    Returns S3 client shared by all S3 instances of the same endpoint and credentials.
+    boto3 clients are thread-safe, so one client (and its connection pool) serves all workers.
+    """
+
+    return boto3.client(
+        service_name=service_name,
+        endpoint_url=s3_host,
+        aws_access_key_id=access_key,
+        aws_secret_access_key=secret_key,
+        # Pool serves parallel multipart parts of several concurrent transfers without dropping connections
+        config=Config(
+            max_pool_connections=64,
+            retries={"mode": "adaptive", "max_attempts": 10},
+            tcp_keepalive=True,
+        ),
+    )
+
+
 class S3(Storage):
+    # Sizes of recently seen keys are cached to save repeated HEAD requests (seconds, number of keys)
+    _size_cache_ttl: float = 60.0
+    _size_cache_max_size: int = 10000
+
     def __init__(
         self,
         s3_host,
@@ -23,6 +55,7 @@ class S3(Storage):
     ):
         """
         Initialize the S3 storage connector
+        Instances share the client of the same endpoint and credentials, upload/download may be called from threads
 
         :param s3_host: Endpoint URL of the S3 service
         :param access_key: Access key
@@ -33,18 +66,27 @@ class S3(Storage):
         :raises S3BucketNotSpecified: If no bucket is provided
         """
 
-        self._s3_client = boto3.client(
-            service_name=service_name,
-            endpoint_url=s3_host,
-            aws_access_key_id=access_key,
-            aws_secret_access_key=secret_key,
-        )
+        self._s3_client = _get_s3_client(service_name, s3_host, access_key, secret_key)
 
         if host_bucket is None:
             raise S3BucketNotSpecified()
 
         self._bucket = host_bucket
 
+        # Large files (Landsat tars) are uploaded as multipart in parallel parts
+        # Downloaded parts are read from the response and written in 1 MiB blocks
+        self._transfer_config = TransferConfig(
+            multipart_threshold=8 * 1024 * 1024,
+            multipart_chunksize=env.get_app__s3_multipart_chunksize(),
+            max_concurrency=env.get_app__s3_max_concurrency(),
+            io_chunksize=1024 * 1024,
+            use_threads=True,
+        )
+
+        # S3 key -> (size, time.monotonic() deadline), lock files are never cached as they change often
+        self._size_cache: dict[str, tuple[int, float]] = {}
+        self._size_cache_lock = threading.Lock()
+
         super().__init__(logger=logger)
 
     def upload(self, remote_file_path: str, local_file_path: Path | str):
@@ -59,7 +101,8 @@ class S3(Storage):
         bucket_key = remote_file_path
 
         self._logger.info(f"Uploading local file '{local_file_path}' to S3 as key '{bucket_key}'")
-        self._s3_client.upload_file(local_file_path, self._bucket, bucket_key)
+        self._s3_client.upload_file(local_file_path, self._bucket, bucket_key, Config=self._transfer_config)
+        self._invalidate_size_cache(bucket_key)
 
     def download(self, remote_file_path: str, local_file_path: Path | str):
         """
@@ -67,7 +110,8 @@ class S3(Storage):
 
         :param remote_file_path: S3 key of the file to download
         :param local_file_path: Local path where the file will be saved
-        :raises botocore.exceptions.ClientError: If the download fails (key not found etc.)
+        :raises FileNotFoundError: If the key does not exist
+        :raises botocore.exceptions.ClientError: If the download fails
         """
 
         local_file_path = str(local_file_path)
@@ -75,14 +119,14 @@ class S3(Storage):
 
         self._logger.info(f"Downloading S3 key '{bucket_key}' into local file '{local_file_path}'")
 
+        # Written straight to the target path, large objects are fetched as parallel ranged GETs
         try:
-            if not self.exists(remote_file_path=remote_file_path):
-                raise FileNotFoundError(file=remote_file_path)
-
-            with open(local_file_path, 'wb') as downloaded_file:
-                self._s3_client.download_fileobj(self._bucket, bucket_key, downloaded_file)
+            self._s3_client.download_file(self._bucket, bucket_key, local_file_path, Config=self._transfer_config)
 
         except botocore.exceptions.ClientError as e:
+            if e.response['Error']['Code'] in ("404", "NoSuchKey"):
+                raise FileNotFoundError(file=remote_file_path)
+
             raise e
 
     def delete(self, remote_file_path: str):
@@ -95,6 +139,7 @@ class S3(Storage):
         bucket_key = remote_file_path
         self._logger.info(f"Deleting S3 key '{bucket_key}'")
         self._s3_client.delete_object(Bucket=self._bucket, Key=bucket_key)
+        self._invalidate_size_cache(bucket_key)
 
     def exists(self, remote_file_path: str, expected_length=None) -> bool:
         """
@@ -108,20 +153,14 @@ class S3(Storage):
 
         bucket_key = str(remote_file_path)
 
-        try:
-            key_head = self._s3_client.head_object(Bucket=self._bucket, Key=bucket_key)
-        except botocore.exceptions.ClientError as e:
-            if e.response['Error']['Code'] == "404":
-                # File/key does not exist
-                return False
-            else:
-                # Could be 403 etc
-                raise e
+        actual_length = self.size(remote_file_path=bucket_key)
+        if actual_length is None:
+            # File/key does not exist
+            return False
 
         # File exists now
 
         if expected_length is not None:
-            actual_length = int(key_head["ContentLength"])
             try:
                 expected_length = int(expected_length)
             except (TypeError, ValueError):
@@ -139,3 +178,127 @@ class S3(Storage):
         else:
             # No size check required
             return True
+
+    def get_bytes(self, remote_file_path: str) -> bytes:
+        """
+        Read a (small) file from S3 into memory
+
+        :param remote_file_path: S3 key of the file to read
+        :return: Content of the file
+        :raises FileNotFoundError: If the key does not exist
+        :raises botocore.exceptions.ClientError: For other errors
+        """
+
+        content, _ = self.get_bytes_with_etag(remote_file_path=remote_file_path)
+        return content
+
+    def get_bytes_with_etag(self, remote_file_path: str) -> Tuple[bytes, str]:
+        """
+        Read a (small) file from S3 into memory together with its ETag
+
+        :param remote_file_path: S3 key of the file to read
+        :return: Content and ETag of the file
+        :raises FileNotFoundError: If the key does not exist
+        :raises botocore.exceptions.ClientError: For other errors
+        """
+
+        try:
+            response = self._s3_client.get_object(Bucket=self._bucket, Key=str(remote_file_path))
+        except botocore.exceptions.ClientError as e:
+            if e.response['Error']['Code'] in ("404", "NoSuchKey"):
+                raise FileNotFoundError(file=remote_file_path)
+            else:
+                raise e
+
+        with response["Body"] as body:
+            return body.read(), response["ETag"]
+
+    def create_exclusive(self, remote_file_path: str, content: bytes) -> str | None:
+        """
+        Atomically create a file in S3 using a conditional write
+
+        :param remote_file_path: S3 key of the file to create
+        :param content: Content of the file
+        :return: ETag of the created file, None if the key already exists
+        :raises botocore.exceptions.ClientError: For other errors
+        """
+
+        try:
+            response = self._s3_client.put_object(
+                Bucket=self._bucket, Key=str(remote_file_path), Body=content, IfNoneMatch="*"
+            )
+        except botocore.exceptions.ClientError as e:
+            if e.response['Error']['Code'] in ("PreconditionFailed", "412", "ConditionalRequestConflict", "409"):
+                # Key exists or is being created by a concurrent request
+                return None
+            else:
+                raise e
+
+        self._invalidate_size_cache(str(remote_file_path))
+
+        return response["ETag"]
+
+    def delete_if_match(self, remote_file_path: str, etag: str) -> bool:
+        """
+        Delete a file from S3 only if it was not changed, using a conditional delete
+
+        :param remote_file_path: S3 key of the file to delete
+        :param etag: Expected ETag of the file
+        :return: True if the file was deleted, False if its ETag differs or it does not exist
+        :raises botocore.exceptions.ClientError: For other errors
+        """
+
+        try:
+            self._s3_client.delete_object(Bucket=self._bucket, Key=str(remote_file_path), IfMatch=etag)
+        except botocore.exceptions.ClientError as e:
+            if e.response['Error']['Code'] in ("PreconditionFailed", "412", "404", "NoSuchKey"):
+                return False
+            else:
+                raise e
+
+        self._invalidate_size_cache(str(remote_file_path))
+
+        return True
+
+    def size(self, remote_file_path: str) -> int | None:
+        """
+        Returns size of a file in S3, sizes of existing files are cached for a short time
+
+        :param remote_file_path: S3 key of the file
+        :return: File size in bytes, None if the file does not exist
+        :raises botocore.exceptions.ClientError: For errors other than a 404
+        """
+
+        bucket_key = str(remote_file_path)
+        cacheable = not bucket_key.endswith(".lock")
+
+        if cacheable:
+            with self._size_cache_lock:
+                cached_size = self._size_cache.get(bucket_key)
+            if cached_size is not None and time.monotonic() < cached_size[1]:
+                return cached_size[0]
+
+        try:
+            key_head = self._s3_client.head_object(Bucket=self._bucket, Key=bucket_key)
+        except botocore.exceptions.ClientError as e:
+            if e.response['Error']['Code'] == "404":
+                self._invalidate_size_cache(bucket_key)
+                return None
+            else:
+                # Could be 403 etc
+                raise e
+
+        size = int(key_head["ContentLength"])
+
+        if cacheable:
+            with self._size_cache_lock:
+                if len(self._size_cache) >= self._size_cache_max_size:
+                    # Oldest entry is dropped
+                    self._size_cache.pop(next(iter(self._size_cache)))
+                self._size_cache[bucket_key] = (size, time.monotonic() + self._size_cache_ttl)
+
+        return size
+
+    def _invalidate_size_cache(self, bucket_key: str):
+        with self._size_cache_lock:
+            self._size_cache.pop(bucket_key, None)
@@ -1,20 +1,30 @@
-import json
 import logging
+import orjson
 import random
-import tempfile
 import time
 import uuid
 
 from abc import ABC, abstractmethod
 from contextlib import contextmanager
+from typing import Tuple
 
 from .exceptions import *
 
+# Lock file content has fixed schema, it is formatted directly instead of being JSON encoded
+_LOCK_CONTENT_TEMPLATE: bytes = b'{"uuid":"%s","timestamp":%f,"ttl":%d}'
+
 
 class Storage(ABC):
+    # Bounds of the decorrelated jitter delay between lock acquisition attempts (seconds)
+    _lock_retry_base_delay: float = 0.05
+    _lock_retry_max_delay: float = 5.0
+
     def __init__(self, logger: logging.Logger):
         self._logger = logger
 
+        # ETags of lock files created by this instance, lock ID -> ETag
+        self._lock_etags: dict[str, str] = {}
+
     @abstractmethod
     def download(self, remote_file_path: str, local_file_path: Path | str):
         pass
@@ -31,6 +41,38 @@ class Storage(ABC):
     def exists(self, remote_file_path: str, expected_length=None) -> bool:
         pass
 
+    @abstractmethod
+    def size(self, remote_file_path: str) -> int | None:
+        pass
+
+    @abstractmethod
+    def get_bytes(self, remote_file_path: str) -> bytes:
+        """
+        Returns content of a (small) file without storing it locally
+        """
+        pass
+
+    @abstractmethod
+    def get_bytes_with_etag(self, remote_file_path: str) -> Tuple[bytes, str]:
+        """
+        Returns content of a (small) file together with its ETag
+        """
+        pass
+
+    @abstractmethod
+    def create_exclusive(self, remote_file_path: str, content: bytes) -> str | None:
+        """
+        Atomically creates file with given content, returns its ETag or None if the file already exists
+        """
+        pass
+
+    @abstractmethod
+    def delete_if_match(self, remote_file_path: str, etag: str) -> bool:
+        """
+        Deletes file only if its ETag matches, returns False if the file was changed or does not exist
+        """
+        pass
+
     @staticmethod
     def _get_lock_file_name(remote_file_path: str) -> str:
         return f"{remote_file_path}.lock"
@@ -50,81 +92,64 @@ class Storage(ABC):
                 try:
                     self.release_lock(remote_file_path=remote_file_path, lock_id=lock_id)
                 except Exception as e:
-                    self._logger.warning(f"Could not release lock for {remote_file_path}: {e}")
+                    self._logger.warning("Could not release lock for %s: %s", remote_file_path, e)
                     raise e
 
     def acquire_lock(self, remote_file_path: str, max_retries: int = 10, ttl: int = 120) -> str:
         lock_file_name = self._get_lock_file_name(remote_file_path)
         assigned_lock_id = str(uuid.uuid4())
 
+        # Short waits while the lock is uncontested, growing with contention, never beyond half of the TTL
+        max_delay = min(self._lock_retry_max_delay, ttl / 2)
+        delay = self._lock_retry_base_delay
+
         for attempt in range(max_retries):
-            if not self.exists(remote_file_path=lock_file_name):
-                self._logger.info(f"Creating lock for {remote_file_path}.")
-                tmp_lock = tempfile.NamedTemporaryFile(mode="w", suffix=".json", delete=False, encoding="utf-8")
-                try:
-                    json.dump(
-                        {
-                            "uuid": assigned_lock_id,
-                            "timestamp": time.time(),
-                            "ttl": ttl,
-                        },
-                        tmp_lock,
-                        indent=2
-                    )
-                finally:
-                    tmp_lock.close()
-
-                self.upload(remote_file_path=lock_file_name, local_file_path=tmp_lock.name)
-
-                verify_tmp = tempfile.NamedTemporaryFile(mode="w+b", delete=False)
-                try:
-                    self.download(remote_file_path=lock_file_name, local_file_path=verify_tmp.name)
-                    with open(verify_tmp.name, "r", encoding="utf-8") as f:
-                        content = json.load(f)
-                    if content.get("uuid") == assigned_lock_id:
-                        return assigned_lock_id
-                finally:
-                    Path(tmp_lock.name).unlink(missing_ok=True)
-                    verify_tmp.close()
-                    Path(verify_tmp.name).unlink(missing_ok=True)
+            # Lock is created only if nobody holds it, so no read back of the lock file is needed
+            lock_content = _LOCK_CONTENT_TEMPLATE % (assigned_lock_id.encode(), time.time(), ttl)
+
+            lock_etag = self.create_exclusive(remote_file_path=lock_file_name, content=lock_content)
+            if lock_etag is not None:
+                self._logger.debug("Created lock for %s.", remote_file_path)
+                self._lock_etags[assigned_lock_id] = lock_etag
+                return assigned_lock_id
 
             else:
-                verify_tmp = tempfile.NamedTemporaryFile(mode="w+b", suffix=".json", delete=False)
                 try:
-                    self.download(remote_file_path=lock_file_name, local_file_path=verify_tmp.name)
-                    with open(verify_tmp.name, "r", encoding="utf-8") as f:
-                        content = json.load(f)
+                    content, stale_lock_etag = self.get_bytes_with_etag(remote_file_path=lock_file_name)
+                    content = orjson.loads(content)
 
                     lock_ttl = content["ttl"]
                     lock_timestamp = content["timestamp"]
 
+                    # Only the expired lock which was read is deleted, if another waiter broke it first
+                    # and created its own lock meanwhile, the delete fails and the lock stays held by the winner
                     if (time.time() - lock_timestamp) > lock_ttl:
-                        self._logger.info(
-                            f"Lock file '{lock_file_name}' expired after {lock_ttl} s, deleting it."
-                        )
-                        self.delete(remote_file_path=lock_file_name)
+                        self._logger.info("Lock file '%s' expired after %s s, deleting it.", lock_file_name, lock_ttl)
+                        if not self.delete_if_match(remote_file_path=lock_file_name, etag=stale_lock_etag):
+                            self._logger.info("Expired lock file '%s' was already replaced.", lock_file_name)
 
-                finally:
-                    verify_tmp.close()
-                    Path(verify_tmp.name).unlink(missing_ok=True)
+                except FileNotFoundError:
+                    # Lock was released meanwhile, next attempt may create it
+                    pass
 
-            time.sleep(0.5 + random.random())
+            delay = min(max_delay, random.uniform(self._lock_retry_base_delay, delay * 3))
+            time.sleep(delay)
 
         raise StorageCannotAcquireLock(file=lock_file_name)
 
     def release_lock(self, remote_file_path: str, lock_id: str):
         lock_file_name = self._get_lock_file_name(remote_file_path)
 
-        verify_tmp = tempfile.NamedTemporaryFile(mode="w+b", suffix=".json", delete=False)
-        try:
-            self.download(remote_file_path=lock_file_name, local_file_path=verify_tmp.name)
-            with open(verify_tmp.name, "r", encoding="utf-8") as f:
-                content = json.load(f)
-            if content.get("uuid") == lock_id:
-                self.delete(remote_file_path=lock_file_name)
-        finally:
-            verify_tmp.close()
-            Path(verify_tmp.name).unlink(missing_ok=True)
+        # Lock file is deleted only if it is still the one created by us, no read of it is needed
+        lock_etag = self._lock_etags.pop(lock_id, None)
+        if lock_etag is not None:
+            if not self.delete_if_match(remote_file_path=lock_file_name, etag=lock_etag):
+                self._logger.warning("Lock for %s expired and was removed or taken over meanwhile.", remote_file_path)
+            return
+
+        content = orjson.loads(self.get_bytes(remote_file_path=lock_file_name))
+        if content.get("uuid") == lock_id:
+            self.delete(remote_file_path=lock_file_name)
 
     ############
     # END LOCKS
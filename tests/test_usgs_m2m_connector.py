@@ -0,0 +1,69 @@
+import importlib
+import unittest
+
+from unittest import mock
+
+connector_module = importlib.import_module("stac_dc.dataset_worker.usgs.usgs_m2m_connector.usgs_m2m_connector")
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float):
+        self.now += seconds
+
+
+class TestFirstPollDelay(unittest.TestCase):
+    # Seconds USGS needs to prepare every requested download
+    preparation_time: float = 100.0
+
+    def setUp(self):
+        self.clock = FakeClock()
+
+        self.connector = connector_module.USGSM2MConnector(
+            dataset="landsat_ot_c2_l2", api_url="https://m2m.example.com/api/", scene_label="test"
+        )
+        self.connector._download_request_min_wait = 1.0
+        self.connector._download_request_max_wait = 3600.0
+        self.connector._download_request_backoff_base = 2.0
+
+        self.connector._request_download = mock.Mock(
+            return_value={"data": {"availableDownloads": [], "preparingDownloads": [{"entityId": "E"}]}}
+        )
+        self.connector._download_retrieve = self._download_retrieve
+
+    def tearDown(self):
+        self.connector.close()
+
+    def _download_retrieve(self) -> dict:
+        if self.clock.now - self.requested_at < self.preparation_time:
+            return {"available": []}
+
+        return {"available": [{"entityId": "E", "url": "https://example.com/E"}]}
+
+    def test_first_poll_delay_does_not_ratchet_upward(self):
+        first_poll_delays = []
+
+        with (
+            mock.patch.object(connector_module, "time", self.clock),
+            mock.patch.object(connector_module.random, "random", return_value=0.5),
+        ):
+            for _ in range(50):
+                self.requested_at = self.clock.now
+                self.connector._download_request([{"entityId": "E", "id": "P"}])
+                first_poll_delays.append(self.connector._first_poll_delay())
+
+        # Polls never start after the downloads are ready, nor later than after the warm-up requests
+        warmed_up_delay = first_poll_delays[self.connector._preparation_times_min_samples]
+        for first_poll_delay in first_poll_delays:
+            self.assertLessEqual(first_poll_delay, self.preparation_time)
+
+        self.assertLessEqual(first_poll_delays[-1], warmed_up_delay)
+
+
+if __name__ == "__main__":
+    unittest.main()